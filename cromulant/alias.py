@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import random
+
+
+class AliasTable:
+    # Vose's alias method, every column keeps its own value with some
+    # probability and hands the rest to an alias, so a draw is one
+    # column pick and one coin flip
+
+    def __init__(self, values: list[int], weights: list[float]) -> None:
+        size = len(values)
+        total = sum(weights)
+        self.values = values
+        self.prob = [1.0] * size
+        self.alias = list(range(size))
+
+        scaled = [weight * size / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1
+
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is 1 give or take rounding errors
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def choose(self) -> int:
+        i = random.randrange(len(self.values))
+
+        if random.random() < self.prob[i]:
+            return self.values[i]
+
+        return self.values[self.alias[i]]
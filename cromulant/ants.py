@@ -1,21 +1,27 @@
 from __future__ import annotations
 
 import re
-import math
 import random
 import itertools
 from typing import ClassVar, Any
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 from .config import Config
 from .args import Args
 from .utils import Utils
 from .storage import Storage
 from .settings import Settings
+from .sampler import AgeSampler
+from .ranking import Ranking
+from .snapshot import Snapshot
 
 
 class Ant:
     def __init__(self) -> None:
         now = Utils.now()
+        self.id = 0
+        self.slot = -1
         self.created = now
         self.updated = now
         self.name = ""
@@ -26,6 +32,7 @@ class Ant:
 
     def to_dict(self) -> dict[str, Any]:
         return {
+            "id": self.id,
             "created": self.created,
             "updated": self.updated,
             "name": self.name,
@@ -36,6 +43,7 @@ class Ant:
         }
 
     def from_dict(self, data: dict[str, Any]) -> None:
+        self.id = data.get("id", 0)
         self.created = data["created"]
         self.updated = data["updated"]
         self.name = data["name"]
@@ -44,6 +52,18 @@ class Ant:
         self.hits = data["hits"]
         self.triumph = data["triumph"]
 
+    def from_row(self, row: tuple[Any, ...]) -> None:
+        (
+            self.id,
+            self.created,
+            self.updated,
+            self.name,
+            self.status,
+            self.method,
+            self.triumph,
+            self.hits,
+        ) = row
+
     def get_name(self) -> str:
         return self.name or "Nameless"
 
@@ -70,8 +90,18 @@ class Ant:
     def get_counts(self) -> str:
         return f" ({self.triumph} - {self.hits} = {self.triumph - self.hits})"
 
+    def get_text(self) -> tuple[str, str]:
+        # The title and message of a feed row
+        if self.method == "hatched":
+            return "Hatched", f"{self.name} is born"
+
+        if self.method == "terminated":
+            return "Terminated", f"{self.name} is gone"
+
+        return self.name, self.get_status()
+
     def get_status(self) -> str:
-        from .game import Method
+        from .engine import Method
 
         if (not self.status) and (not self.method):
             return "No update yet"
@@ -98,6 +128,17 @@ class Ant:
 class Ants:
     ants: ClassVar[list[Ant]] = []
     top: ClassVar[Ant | None] = None
+    next_id: int = 1
+    records: ClassVar[list[list[Any]]] = []
+    journal_size: int = 0
+    compact: bool = False
+    changed: ClassVar[dict[int, Ant]] = {}
+    removed: ClassVar[set[int]] = set()
+    batch_depth: int = 0
+    batch_changed: bool = False
+    sampler: ClassVar[AgeSampler] = AgeSampler()
+    ranking: ClassVar[Ranking] = Ranking()
+    by_id: ClassVar[dict[int, Ant]] = {}
 
     @staticmethod
     def prepare() -> None:
@@ -111,61 +152,206 @@ class Ants:
             Ants.populate(Args.population)
 
     @staticmethod
-    def hatch(num: int = 1, ignore: list[str] | None = None) -> None:
-        from .game import Game
+    def hatch(
+        num: int = 1, ignore: list[str] | None = None, render: bool = True
+    ) -> None:
+        from .engine import Engine
 
-        for _ in range(num):
-            ant = Ant()
-            ant.name = Ants.random_name(ignore)
-            Ants.ants.append(ant)
+        ants = [Ant() for _ in range(num)]
 
-            if Settings.verbose:
-                Game.update(ant)
+        for ant, name in zip(ants, Ants.random_names(num, ignore), strict=True):
+            ant.name = name
+
+        Ants.add_many(ants)
+
+        for ant in ants:
+            Ants.touch(ant)
+            Ants.record("h", ant.to_dict())
+
+        if render and Settings.verbose:
+            # Older rows would be pushed out of the view right away
+            for ant in ants[-Config.max_updates :]:
+                Engine.emit("update", ant)
 
         Ants.on_change()
 
     @staticmethod
     def on_change() -> None:
-        from .game import Game
+        from .engine import Engine
+
+        # Batches recompute and save once when they end
+        if Ants.batch_depth:
+            Ants.batch_changed = True
+            return
 
         Ants.get_top()
-        Game.info()
+        Engine.emit("info")
         Ants.save()
 
     @staticmethod
-    def random_ant(ignore: list[Ant] | None = None) -> Ant | None:
-        if ignore:
-            ants = [a for a in Ants.ants if a not in ignore]
-        else:
-            ants = Ants.ants
+    @contextmanager
+    def batch() -> Iterator[None]:
+        Ants.begin_batch()
+
+        try:
+            yield
+        finally:
+            Ants.end_batch()
+
+    @staticmethod
+    def begin_batch() -> None:
+        Ants.batch_depth += 1
 
-        return random.choice(ants)
+    @staticmethod
+    def end_batch() -> None:
+        Ants.batch_depth -= 1
+
+        if (not Ants.batch_depth) and Ants.batch_changed:
+            Ants.batch_changed = False
+            Ants.on_change()
+
+    @staticmethod
+    def place(ant: Ant) -> None:
+        if not ant.id:
+            ant.id = Ants.next_id
+
+        Ants.next_id = max(Ants.next_id, ant.id + 1)
+        ant.slot = len(Ants.ants)
+        Ants.ants.append(ant)
+        Ants.by_id[ant.id] = ant
+        Utils.names.take(ant.name)
+
+    @staticmethod
+    def add(ant: Ant) -> None:
+        Ants.place(ant)
+        Ants.sampler.append(ant.updated)
+        Ants.ranking.add(ant)
 
     @staticmethod
-    def get_names() -> list[str]:
-        return [ant.name for ant in Ants.ants]
+    def add_many(ants: list[Ant]) -> None:
+        size = len(Ants.ants)
+
+        for ant in ants:
+            Ants.place(ant)
+
+        # Rebuilding is cheaper when most of the colony is new
+        if len(ants) > size:
+            Ants.sampler.build([ant.updated for ant in Ants.ants])
+            Ants.ranking.build(Ants.ants)
+            return
+
+        for ant in ants:
+            Ants.sampler.append(ant.updated)
+            Ants.ranking.add(ant)
+
+    @staticmethod
+    def remove(ant: Ant) -> None:
+        # Move the last ant into the empty slot
+        last = Ants.ants.pop()
+        sampler = Ants.sampler
+
+        if last is not ant:
+            Ants.ants[ant.slot] = last
+            last.slot = ant.slot
+            sampler.set(ant.slot, sampler.values[-1])
+
+        sampler.pop()
+        ant.slot = -1
+        Ants.by_id.pop(ant.id, None)
+        Utils.names.release(ant.name)
+        Ants.ranking.remove(ant)
+
+    @staticmethod
+    def reindex() -> None:
+        for slot, ant in enumerate(Ants.ants):
+            ant.slot = slot
+
+        Ants.by_id = {ant.id: ant for ant in Ants.ants}
+        Utils.names.reset()
+
+        for ant in Ants.ants:
+            Utils.names.take(ant.name)
+
+        Ants.sampler.build([ant.updated for ant in Ants.ants])
+
+    @staticmethod
+    def touch(ant: Ant) -> None:
+        Ants.changed[ant.id] = ant
+
+    @staticmethod
+    def changes() -> list[list[Any]]:
+        records: list[list[Any]] = [["t", ant_id] for ant_id in Ants.removed]
+        records.extend(["h", ant.to_dict()] for ant in Ants.changed.values())
+        return records
+
+    @staticmethod
+    def journaling() -> bool:
+        return Args.journal or Storage.use_db()
+
+    @staticmethod
+    def record(*record: Any) -> None:
+        if not Ants.journaling():
+            return
+
+        Ants.records.append(list(record))
+
+    @staticmethod
+    def random_ant(ignore: list[Ant] | None = None) -> Ant | None:
+        if not ignore:
+            if not Ants.ants:
+                return None
+
+            return random.choice(Ants.ants)
+
+        ids = {ant.id for ant in ignore if ant.id in Ants.by_id}
+
+        if len(ids) >= len(Ants.ants):
+            return None
+
+        # Only a few ants get ignored, so a couple of draws are enough
+
+        while True:
+            ant = random.choice(Ants.ants)
+
+            if ant.id not in ids:
+                return ant
 
     @staticmethod
     def save() -> None:
-        Storage.save_ants(Ants.ants)
+        # Without a journal only save what changed since the last save
+        if not Ants.journaling():
+            Ants.records = Ants.changes()
+
+        Ants.changed = {}
+        Ants.removed = set()
+        use_db = Storage.use_db()
+
+        # Databases apply records in place, there is nothing to compact
+        if not use_db:
+            Ants.journal_size += len(Ants.records)
+
+        if Ants.compact or (Ants.journal_size > Config.journal_max):
+            # Keep the history of what led to the snapshot
+            if use_db and Ants.records:
+                Storage.append_journal(Ants.records)
+
+            Storage.save_ants(Ants.ants)
+            Ants.journal_size = 0
+            Ants.compact = False
+        elif Ants.records:
+            Storage.append_journal(Ants.records)
+
+        Ants.records = []
 
     @staticmethod
     def get_next() -> Ant | None:
-        now = Utils.now()
-        ages = [(now - ant.updated) for ant in Ants.ants]
-
-        # Normalize ages to create weights
-        total_age = sum(ages)
+        # Older updates are more likely to be picked
+        slot = Ants.sampler.choose(Utils.now())
 
-        if total_age == 0:
-            weights = [1] * len(Ants.ants)  # If all ages are zero, use equal weights
-        else:
-            weights = [
-                int((age / total_age) * 1000) for age in ages
-            ]  # Scale and cast to int
+        if slot is None:
+            return None
 
-        # Perform weighted random selection
-        return random.choices(Ants.ants, weights=weights, k=1)[0]
+        return Ants.ants[slot]
 
     @staticmethod
     def get_current() -> Ant | None:
@@ -173,12 +359,19 @@ class Ants:
 
     @staticmethod
     def set_status(ant: Ant, status: str, method: str) -> None:
-        from .game import Game, Opts
+        from .engine import Engine, Opts
 
         status = status.strip()
         ant.status = status
         ant.method = method
         ant.updated = Utils.now()
+        Ants.sampler.set(ant.slot, ant.updated)
+        Ants.ranking.update(ant)
+        Ants.touch(ant)
+
+        Ants.record(
+            "s", ant.id, ant.status, ant.method, ant.updated, ant.triumph, ant.hits
+        )
 
         Ants.on_change()
 
@@ -186,72 +379,154 @@ class Ants:
             if not Settings.verbose:
                 return
 
-        Game.update(ant)
+        Engine.emit("update", ant)
 
     @staticmethod
     def get() -> None:
         if Args.clean:
             objs = []
+            records = []
         else:
             objs = Storage.get_ants()
+            records = Storage.get_journal()
+
+        loaded: list[Ant] = []
+
+        if isinstance(objs, Snapshot):
+            for row in objs.table():
+                ant = Ant()
+                ant.from_row(row)
+                loaded.append(ant)
+        else:
+            for obj in objs:
+                ant = Ant()
+                ant.from_dict(obj)
+                loaded.append(ant)
+
+        Ants.next_id = max((ant.id for ant in loaded), default=0) + 1
+
+        for ant in loaded:
+            if not ant.id:
+                # Old data without ids, the journal needs them saved
+                Ants.compact = True
+                ant.id = Ants.next_id
+                Ants.next_id += 1
+
+        # The indexes are built once, after the journal
+        Ants.ants = loaded
+        Ants.replay(records)
+
+    @staticmethod
+    def replay(records: list[Any]) -> None:
+        ants = {ant.id: ant for ant in Ants.ants}
 
-        for obj in objs:
+        def hatch(data: dict[str, Any]) -> None:
             ant = Ant()
-            ant.from_dict(obj)
-            Ants.ants.append(ant)
+            ant.from_dict(data)
+            ants[ant.id] = ant
+            Ants.next_id = max(Ants.next_id, ant.id + 1)
+
+        for record in records:
+            kind = record[0]
+
+            if kind == "h":
+                hatch(record[1])
+            elif kind == "s":
+                ant = ants.get(record[1])
+
+                if not ant:
+                    continue
+
+                ant.status = record[2]
+                ant.method = record[3]
+                ant.updated = record[4]
+                ant.triumph = record[5]
+                ant.hits = record[6]
+            elif kind == "t":
+                ants.pop(record[1], None)
+            elif kind == "m":
+                ants.pop(record[1], None)
+                ants.pop(record[2], None)
+                hatch(record[3])
+
+        Ants.ants = list(ants.values())
+        Ants.reindex()
+        Ants.ranking.build(Ants.ants)
+        Ants.journal_size = len(records)
 
     @staticmethod
     def populate(num: int) -> None:
-        Ants.clear()
-        Ants.hatch(num)
+        with Ants.batch():
+            Ants.clear()
+            Ants.hatch(num)
 
     @staticmethod
-    def random_name(ignore: list[str] | None = None) -> str:
-        names = Ants.get_names()
-
-        if ignore:
-            for name in ignore:
-                if name not in names:
-                    names.append(name)
-
+    def random_names(num: int, ignore: list[str] | None = None) -> list[str]:
+        # The pool knows which names are in use by the colony
         if Args.use_names:
-            return Utils.random_name(names)
+            return Utils.random_names(num, ignore or [])
 
-        return Utils.make_name(names)
+        return Utils.make_names(num)
 
     @staticmethod
     def get_top() -> None:
-        top: Ant | None = None
-        top_weighted = float("-inf")
-        top_score = float("-inf")
-
-        for ant in Ants.ants:
-            score = ant.get_score()
-            log_factor = 1 + math.log(ant.triumph + 1)
-            weighted_score = score * log_factor
-
-            if (not top) or (weighted_score > top_weighted):
-                top = ant
-                top_weighted = weighted_score
-                top_score = score
-            elif weighted_score == top_weighted:
-                if score > top_score:
-                    top = ant
-                    top_score = score
-                elif (score == top_score) and (ant.created < top.created):
-                    top = ant
+        top = Ants.ranking.top()
 
         if not top:
             return
 
         Ants.top = top
 
+    @staticmethod
+    def top_k(k: int) -> list[Ant]:
+        return Ants.ranking.top_k(k)
+
     @staticmethod
     def merge(ant_1: Ant | None = None) -> bool:
-        from .game import Game
+        from .engine import Engine
+
+        if not ant_1:
+            ant_1 = Ants.random_ant()
+
+        if not ant_1:
+            return False
+
+        ant_2 = Ants.random_ant([ant_1])
+
+        if not ant_2:
+            return False
+
+        name = Ants.merge_name(ant_1.name, ant_2.name)
+
+        if not name:
+            return False
 
-        def split(ant: Ant) -> list[str]:
-            return re.split(r"[ -]", ant.name)
+        with Ants.batch():
+            Ants.set_terminated(ant_1)
+            Ants.set_terminated(ant_2)
+
+            ant = Ant()
+            ant.name = name
+            ant.triumph = ant_1.triumph + ant_2.triumph
+            ant.hits = ant_1.hits + ant_2.hits
+
+            Ants.add(ant)
+            Ants.touch(ant)
+            Ants.record(
+                "m", ant_1.id, ant_2.id, ant.to_dict(), ant_1.to_dict(), ant_2.to_dict()
+            )
+
+            if Settings.verbose:
+                Engine.emit("update", ant)
+
+            Ants.hatch(ignore=[ant_1.name, ant_2.name])
+
+        return True
+
+    @staticmethod
+    def merge_name(name_1: str, name_2: str) -> str:
+        def split(name: str) -> list[str]:
+            return re.split(r"[ -]", name)
 
         def remove(words: list[str], ignore: list[str]) -> list[str]:
             return [word for word in words if word.lower() not in ignore]
@@ -271,74 +546,59 @@ class Ants:
 
             return [Utils.capitalize(word) for word in words]
 
-        if not ant_1:
-            ant_1 = Ants.random_ant()
-
-        if not ant_1:
-            return False
-
-        ant_2 = Ants.random_ant([ant_1])
-
-        if not ant_2:
-            return False
-
-        words_1 = split(ant_1)
-        words_2 = split(ant_2)
+        words_1 = split(name_1)
+        words_2 = split(name_2)
         words_1 = fill(words_1)
         words_2 = fill(words_2)
 
         name = ""
-        names = Ants.get_names()
         combinations = list(itertools.product(words_1, words_2))
         random.shuffle(combinations)
 
         for combo in combinations:
             possible = f"{combo[0]} {combo[1]}"
 
-            if (possible == ant_1.name) or (possible == ant_2.name):
+            if (possible == name_1) or (possible == name_2):
                 continue
 
-            if (possible in names) or (possible in Utils.names):
+            if possible in Utils.names:
                 continue
 
             name = possible
             break
 
-        if not name:
-            return False
-
-        Ants.set_terminated(ant_1)
-        Ants.set_terminated(ant_2)
-
-        ant = Ant()
-        ant.name = name
-        ant.triumph = ant_1.triumph + ant_2.triumph
-        ant.hits = ant_1.hits + ant_2.hits
-
-        Ants.ants.append(ant)
-
-        if Settings.verbose:
-            Game.update(ant)
-
-        Ants.hatch(ignore=[ant_1.name, ant_2.name])
-        return True
+        return name
 
     @staticmethod
     def clear() -> None:
         Ants.ants = []
+        Ants.reindex()
+        Ants.ranking.clear()
+        Ants.records = []
+        Ants.changed = {}
+        Ants.removed = set()
+        Ants.compact = True
 
     @staticmethod
     def terminate(ant: Ant) -> None:
-        Ants.set_terminated(ant)
-        Ants.hatch(ignore=[ant.name])
+        with Ants.batch():
+            Ants.set_terminated(ant)
+            Ants.record("t", ant.id, ant.to_dict())
+            Ants.hatch(ignore=[ant.name])
 
     @staticmethod
     def set_terminated(ant: Ant) -> None:
-        from .game import Game
+        from .engine import Engine
 
         ant.method = "terminated"
 
         if Settings.verbose:
-            Game.update(ant)
+            Engine.emit("update", ant)
+
+        Ants.drop(ant)
 
-        Ants.ants.remove(ant)
+    @staticmethod
+    def drop(ant: Ant) -> None:
+        Ants.remove(ant)
+        Ants.changed.pop(ant.id, None)
+        Ants.removed.add(ant.id)
@@ -43,6 +43,11 @@ class Args:
     sim_name: str = ""
     font_size: int = 20
     use_names: int = True
+    journal: bool = False
+    write_delay: int = 0
+    sentence_pool: int = 0
+    sentence_refill: int = 0
+    catch_up: bool = False
 
     @staticmethod
     def prepare() -> None:
@@ -90,6 +95,11 @@ class Args:
             "sim_directory",
             "sim_name",
             "font_size",
+            "journal",
+            "write_delay",
+            "sentence_pool",
+            "sentence_refill",
+            "catch_up",
         ]
 
         for n_item in normals:
@@ -77,7 +77,7 @@ class ArgSpec:
         ArgSpec.add_argument(
             "names",
             type=str,
-            info="Path to a JSON file with a list of names. Use these instead of the default ones",
+            info="Path to a JSON file with a list of names, or a .txt file with one name per line. Use these instead of the default ones",
         )
 
         ArgSpec.add_argument(
@@ -89,7 +89,7 @@ class ArgSpec:
         ArgSpec.add_argument(
             "ants",
             type=str,
-            info="Path to a JSON file with ants data. Use this instead of the default one",
+            info="Path to a JSON file with ants data. Use this instead of the default one. Use a .db path to keep the ants in an SQLite database, or a .bin path for a compact binary snapshot",
         )
 
         ArgSpec.add_argument(
@@ -153,6 +153,36 @@ class ArgSpec:
             info="Start with clean ants data",
         )
 
+        ArgSpec.add_argument(
+            "journal",
+            action="store_true",
+            info="Log every event in the journal file instead of only the ants that changed",
+        )
+
+        ArgSpec.add_argument(
+            "catch_up",
+            action="store_true",
+            info="Run the updates that were missed while the program was closed (faster with numpy)",
+        )
+
+        ArgSpec.add_argument(
+            "write_delay",
+            type=int,
+            info="Milliseconds to wait so bursts of changes are saved in a single write",
+        )
+
+        ArgSpec.add_argument(
+            "sentence_pool",
+            type=int,
+            info="How many sentences of each kind to generate in advance",
+        )
+
+        ArgSpec.add_argument(
+            "sentence_refill",
+            type=int,
+            info="Refill the sentences when one of the pools gets below this size",
+        )
+
         ArgSpec.add_argument(
             "population",
             type=int,
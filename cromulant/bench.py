@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+import resource
+import tempfile
+from pathlib import Path
+from typing import ClassVar, Any
+from collections.abc import Callable
+
+from .config import Config
+from .args import Args
+from .utils import Utils
+from .ants import Ants
+from .settings import Settings
+from .engine import Engine
+
+
+class Bench:
+    phases: ClassVar[dict[str, float]] = {}
+    stack: ClassVar[list[float]] = []
+
+    @staticmethod
+    def timed(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        # Time spent in nested phases only counts for the inner one
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            Bench.stack.append(0.0)
+            start = time.perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                total = time.perf_counter() - start
+                nested = Bench.stack.pop()
+                Bench.phases[name] = Bench.phases.get(name, 0.0) + total - nested
+
+                if Bench.stack:
+                    Bench.stack[-1] += total
+
+        return wrapper
+
+    @staticmethod
+    def instrument() -> None:
+        phases: dict[str, tuple[type, str]] = {
+            "pick": (Ants, "get_next"),
+            "choose": (Engine, "choose"),
+            "status": (Engine, "make_status"),
+            "apply": (Ants, "set_status"),
+            "merge": (Ants, "merge"),
+            "hatch": (Ants, "hatch"),
+            "save": (Ants, "save"),
+        }
+
+        for name, (cls, attr) in phases.items():
+            func = Bench.timed(name, getattr(cls, attr))
+            setattr(cls, attr, staticmethod(func))
+
+    @staticmethod
+    def peak_memory() -> float:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Kilobytes on Linux, bytes on macOS
+        if sys.platform == "darwin":
+            return peak / (1024 * 1024)
+
+        return peak / 1024
+
+    @staticmethod
+    def run(population: int, ticks: int, vector: bool) -> None:
+        start = time.perf_counter()
+        Ants.populate(population)
+        hatch_time = time.perf_counter() - start
+
+        Bench.phases = {}
+        start = time.perf_counter()
+
+        for _ in range(ticks):
+            Engine.tick()
+
+        elapsed = time.perf_counter() - start
+        phases = dict(Bench.phases)
+        phases["other"] = max(0.0, elapsed - sum(phases.values()))
+
+        Utils.print(
+            f"{population} ants: {ticks / elapsed:.1f} ticks/s"
+            f" | hatched in {hatch_time:.2f}s"
+            f" | peak memory {Bench.peak_memory():.0f} MB"
+        )
+
+        for name, seconds in sorted(phases.items(), key=lambda item: -item[1]):
+            ms = seconds * 1000 / ticks
+            percent = seconds * 100 / elapsed
+            Utils.print(f"  {name}: {ms:.3f} ms/tick ({percent:.1f}%)")
+
+        if vector:
+            Bench.run_vector(ticks, ticks / elapsed)
+
+    @staticmethod
+    def run_vector(ticks: int, scalar: float) -> None:
+        from .vector import VectorColony
+
+        start = time.perf_counter()
+        colony = VectorColony()
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        colony.run(ticks)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        row = colony.top()
+        top_time = time.perf_counter() - start
+        top_id = -1 if row is None else int(colony.ids[row])
+
+        start = time.perf_counter()
+        colony.apply()
+        apply_time = time.perf_counter() - start
+        same = top_id == (Ants.top.id if Ants.top else -1)
+
+        speed = ticks / elapsed
+        total = ticks / (load_time + elapsed + apply_time)
+
+        Utils.print(
+            f"  vector: {speed:.1f} ticks/s ({speed / scalar:.1f}x)"
+            f" | {total:.1f} ticks/s counting load and apply ({total / scalar:.1f}x)"
+        )
+
+        Utils.print(
+            f"  vector top: {top_time * 1000:.2f} ms"
+            f" | {'same as' if same else 'differs from'} the ranking"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the colony without a window and measure it"
+    )
+
+    parser.add_argument(
+        "--ticks", type=int, default=1000, help="How many ticks to run each time"
+    )
+
+    parser.add_argument(
+        "--populations",
+        type=str,
+        default="25,1000,100000,1000000",
+        help="Comma separated colony sizes to run",
+    )
+
+    parser.add_argument(
+        "--storage",
+        type=str,
+        choices=["json", "db", "bin"],
+        default="json",
+        help="Kind of ants file to save to",
+    )
+
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="Log every event in the journal file",
+    )
+
+    parser.add_argument(
+        "--vector",
+        action="store_true",
+        help="Also run the ticks with the numpy engine and compare",
+    )
+
+    args = parser.parse_args()
+    populations = [int(num) for num in args.populations.split(",") if num.strip()]
+    Config.prepare()
+
+    # Nothing is saved over the real colony or settings
+    with tempfile.TemporaryDirectory() as directory:
+        Config.settings_json = Path(directory) / "settings.json"
+        Config.settings_json.write_text("{}")
+        Config.ants_json = Path(directory) / "ants.json"
+        Config.ants_json.write_text("[]")
+        Args.ants = Path(directory) / f"ants.{args.storage}"
+        Args.journal = args.journal
+
+        Utils.prepare()
+        Settings.prepare()
+        Engine.prepare()
+        Bench.instrument()
+
+        for population in populations:
+            Bench.run(population, args.ticks, args.vector)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,11 @@ class Config:
     text_color: str = "#ffffff"
     image_size: int = 80
     space_1: int = 18
+    feed_margin: int = 10
     max_updates: int = 300
+    hatch_chunk: int = 500
+    name_model_sample: int = 10000
+    catch_up_max: int = 100000
     fast_seconds: int = 5
     normal_minutes: float = 1
     slow_minutes: float = 5
@@ -53,6 +57,11 @@ class Config:
     input_border_color: str = "rgb(120, 120, 120)"
     input_caret_color: str = "rgb(18, 18, 18)"
     settings_json: Path
+    cache_dir: Path
+    glyphs_json: Path
+    words_json: Path
+    name_model_json: Path
+    word_max_length: int = 8
     countries_json: Path
     filter_debouncer_delay: int = 80
     merge_goal: int = 10
@@ -63,6 +72,11 @@ class Config:
     ant: str = "🐜"
     arguments_path: Path
     fade_duration: int = 500
+    fade_frame: int = 16
+    journal_max: int = 1000
+    write_delay: int = 500
+    sentence_pool: int = 20
+    sentence_refill: int = 5
 
     @staticmethod
     def prepare() -> None:
@@ -89,6 +103,12 @@ class Config:
             Config.settings_json.parent.mkdir(parents=True, exist_ok=True)
             Config.settings_json.write_text("{}")
 
+        Config.cache_dir = Path(appdirs.user_cache_dir()) / Config.program
+        Config.cache_dir.mkdir(parents=True, exist_ok=True)
+        Config.glyphs_json = Config.cache_dir / "glyphs.json"
+        Config.words_json = Config.cache_dir / "words.json"
+        Config.name_model_json = Config.cache_dir / "name_model.json"
+
         Config.names_json = Config.here / "data" / "names.json"
         Config.countries_json = Config.here / "data" / "countries.json"
         Config.icon_path = Config.here / "img" / "icon.jpg"
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, ClassVar
+from pathlib import Path
+from contextlib import closing
+
+from .utils import Utils
+
+
+class Database:
+    # The writer keeps one connection open between flushes
+    conn: ClassVar[sqlite3.Connection | None] = None
+    conn_path: ClassVar[Path | None] = None
+
+    # Files that already have the tables
+    ready: ClassVar[set[Path]] = set()
+
+    columns = (
+        "id",
+        "created",
+        "updated",
+        "name",
+        "status",
+        "method",
+        "triumph",
+        "hits",
+    )
+
+    schema = """
+    create table if not exists ants (
+        id integer primary key,
+        created integer not null,
+        updated integer not null,
+        name text not null,
+        status text not null,
+        method text not null,
+        triumph integer not null,
+        hits integer not null,
+        score integer not null
+    );
+
+    create index if not exists ants_updated on ants (updated);
+    create index if not exists ants_score on ants (score);
+
+    create table if not exists history (
+        id integer primary key autoincrement,
+        ant integer not null,
+        time integer not null,
+        name text not null,
+        method text not null,
+        status text not null,
+        triumph integer not null,
+        hits integer not null
+    );
+
+    create index if not exists history_ant on history (ant);
+    create index if not exists history_time on history (time);
+    """
+
+    upsert = """
+    insert into ants (id, created, updated, name, status, method, triumph, hits, score)
+    values (:id, :created, :updated, :name, :status, :method, :triumph, :hits, :score)
+    on conflict (id) do update set
+        created = excluded.created,
+        updated = excluded.updated,
+        name = excluded.name,
+        status = excluded.status,
+        method = excluded.method,
+        triumph = excluded.triumph,
+        hits = excluded.hits,
+        score = excluded.score
+    """
+
+    update = """
+    update ants set
+        status = :status,
+        method = :method,
+        updated = :updated,
+        triumph = :triumph,
+        hits = :hits,
+        score = :score
+    where id = :id
+    """
+
+    # Ants that are removed are logged as they were in the record
+    log_ant = """
+    insert into history (ant, time, name, method, status, triumph, hits)
+    values (:id, :time, :name, :method, :status, :triumph, :hits)
+    """
+
+    log = """
+    insert into history (ant, time, name, method, status, triumph, hits)
+    select id, :time, name, :method, status, triumph, hits
+    from ants where id = :id
+    """
+
+    @staticmethod
+    def connect(path: Path, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        conn.row_factory = sqlite3.Row
+
+        if path not in Database.ready:
+            conn.executescript(Database.schema)
+            Database.ready.add(path)
+
+        return conn
+
+    @staticmethod
+    def get_writer(path: Path) -> sqlite3.Connection:
+        # Writes are serialized by the writer, which may run them on
+        # its own thread or right away on this one
+        if (not Database.conn) or (Database.conn_path != path):
+            Database.close()
+            Database.conn = Database.connect(path, check_same_thread=False)
+            Database.conn_path = path
+
+        return Database.conn
+
+    @staticmethod
+    def close() -> None:
+        if Database.conn:
+            Database.conn.close()
+
+        Database.conn = None
+        Database.conn_path = None
+
+    @staticmethod
+    def get_ants(path: Path) -> list[dict[str, Any]]:
+        cols = ", ".join(Database.columns)
+
+        with closing(Database.connect(path)) as conn:
+            rows = conn.execute(f"select {cols} from ants order by id")
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    def apply(path: Path, records: list[Any]) -> None:
+        now = Utils.now()
+
+        def hatch(data: dict[str, Any], method: str) -> None:
+            conn.execute(Database.upsert, Database.row(data))
+            log(data["id"], data["created"], method)
+
+        def remove(ant_id: int, data: dict[str, Any] | None) -> None:
+            if data:
+                values = {**data, "time": now, "method": "terminated"}
+                conn.execute(Database.log_ant, values)
+            else:
+                log(ant_id, now, "terminated")
+
+            conn.execute("delete from ants where id = ?", (ant_id,))
+
+        def log(ant_id: int, time: int, method: str) -> None:
+            conn.execute(Database.log, {"id": ant_id, "time": time, "method": method})
+
+        conn = Database.get_writer(path)
+
+        with conn:
+            for record in records:
+                kind = record[0]
+
+                if kind == "h":
+                    hatch(record[1], "hatched")
+                elif kind == "s":
+                    ant_id, status, method, updated, triumph, hits = record[1:7]
+
+                    conn.execute(
+                        Database.update,
+                        {
+                            "id": ant_id,
+                            "status": status,
+                            "method": method,
+                            "updated": updated,
+                            "triumph": triumph,
+                            "hits": hits,
+                            "score": triumph - hits,
+                        },
+                    )
+
+                    log(ant_id, updated, method)
+                elif kind == "a":
+                    # A full rewrite, which has no history of its own
+                    conn.execute("delete from ants")
+                    rows = [Database.row(obj) for obj in record[1]]
+                    conn.executemany(Database.upsert, rows)
+                elif kind == "t":
+                    # Older records only have the id
+                    remove(record[1], record[2] if len(record) > 2 else None)
+                elif kind == "m":
+                    data = record[4:6] if len(record) > 5 else [None, None]
+                    remove(record[1], data[0])
+                    remove(record[2], data[1])
+                    hatch(record[3], "merge")
+
+    @staticmethod
+    def get_history(path: Path, ant_id: int | None = None) -> list[dict[str, Any]]:
+        query = "select * from history"
+        params: tuple[Any, ...] = ()
+
+        if ant_id is not None:
+            query += " where ant = ?"
+            params = (ant_id,)
+
+        query += " order by id"
+
+        with closing(Database.connect(path)) as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    @staticmethod
+    def row(data: dict[str, Any]) -> dict[str, Any]:
+        row = {col: data[col] for col in Database.columns}
+        row["score"] = data["triumph"] - data["hits"]
+        return row
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import random
+from typing import ClassVar, Any
+from collections.abc import Callable
+
+from .config import Config
+from .args import Args
+from .utils import Utils
+from .ants import Ant
+from .ants import Ants
+from .settings import Settings
+from .sentences import Sentences
+from .alias import AliasTable
+
+
+class Method:
+    merge = "merge"
+    triumph = "triumph"
+    hit = "hit"
+    travel = "travel"
+    think = "think"
+    words = "words"
+
+
+class Opt:
+    value = 0
+
+    def __init__(self, weight: int, method: str) -> None:
+        self.value = Opt.value
+        self.weight = weight
+        self.method = method
+
+        Opt.value += 1
+
+
+class Opts:
+    merge: Opt
+    triumph: Opt
+    hit: Opt
+    travel: Opt
+    think: Opt
+    words: Opt
+    tables: ClassVar[dict[tuple[bool, ...], AliasTable | None]] = {}
+
+    @staticmethod
+    def prepare() -> None:
+        Opts.merge = Opt(Args.weight_merge, Method.merge)
+        Opts.triumph = Opt(Args.weight_triumph, Method.triumph)
+        Opts.hit = Opt(Args.weight_hit, Method.hit)
+        Opts.travel = Opt(Args.weight_travel, Method.travel)
+        Opts.think = Opt(Args.weight_think, Method.think)
+        Opts.words = Opt(Args.weight_words, Method.words)
+        Opts.tables = {}
+
+    @staticmethod
+    def opts_score() -> list[Opt]:
+        return [Opts.triumph, Opts.hit]
+
+    @staticmethod
+    def opts_travel() -> list[Opt]:
+        return [Opts.travel]
+
+    @staticmethod
+    def opts_think() -> list[Opt]:
+        return [Opts.think]
+
+    @staticmethod
+    def opts_words() -> list[Opt]:
+        return [Opts.words]
+
+    @staticmethod
+    def get_table(merge: bool) -> AliasTable | None:
+        key = (
+            merge,
+            Settings.score_enabled,
+            Settings.travel_enabled,
+            Settings.think_enabled,
+            Settings.words_enabled,
+        )
+
+        # One table for each combination of settings, made when first used
+        if key not in Opts.tables:
+            Opts.tables[key] = Opts.make_table(*key)
+
+        return Opts.tables[key]
+
+    @staticmethod
+    def make_table(
+        merge: bool, score: bool, travel: bool, think: bool, words: bool
+    ) -> AliasTable | None:
+        opts: list[Opt] = []
+
+        if merge:
+            opts.append(Opts.merge)
+
+        if score:
+            opts.extend(Opts.opts_score())
+
+        if travel:
+            opts.extend(Opts.opts_travel())
+
+        if think:
+            opts.extend(Opts.opts_think())
+
+        if words:
+            opts.extend(Opts.opts_words())
+
+        opts = [opt for opt in opts if opt.weight > 0]
+
+        if not opts:
+            return None
+
+        return AliasTable([opt.value for opt in opts], [opt.weight for opt in opts])
+
+
+class Engine:
+    # The colony without any interface, which listens to the events
+    listeners: ClassVar[dict[str, list[Callable[..., None]]]] = {}
+    merge_charge: int = 0
+
+    # The last event of each ant while replaying, described at the end
+    pending: ClassVar[dict[int, tuple[Ant, int]] | None] = None
+
+    @staticmethod
+    def prepare() -> None:
+        Opts.prepare()
+        Engine.listeners = {}
+        Engine.merge_charge = 0
+
+    @staticmethod
+    def on(event: str, func: Callable[..., None]) -> None:
+        Engine.listeners.setdefault(event, []).append(func)
+
+    @staticmethod
+    def emit(event: str, *args: Any) -> None:
+        for func in Engine.listeners.get(event, []):
+            func(*args)
+
+    @staticmethod
+    def get_interval(speed: str) -> int:
+        # Milliseconds between ticks, 0 when paused
+        if speed == "fast":
+            minutes = (Args.fast_seconds or Config.fast_seconds) / 60
+        elif speed == "normal":
+            minutes = Args.normal_minutes or Config.normal_minutes
+        elif speed == "slow":
+            minutes = Args.slow_minutes or Config.slow_minutes
+        else:
+            return 0
+
+        return max(1000, int(minutes * 60 * 1000))
+
+    @staticmethod
+    def catch_up() -> int:
+        from .vector import VectorColony
+        from .vector import VectorError
+
+        # Run the ticks that were missed while the program was closed
+        msecs = Engine.get_interval(Settings.speed)
+        current = Ants.get_current() if Ants.ants else None
+
+        if (not msecs) or (not current):
+            return 0
+
+        interval = max(1, round(msecs / 1000))
+        ticks = (Utils.now() - current.updated) // interval
+        ticks = min(ticks, Config.catch_up_max)
+
+        if ticks <= 0:
+            return 0
+
+        start = Utils.now() - (ticks - 1) * interval
+
+        try:
+            colony = VectorColony()
+        except VectorError:
+            Engine.replay(ticks, start, interval)
+            return ticks
+
+        colony.run(ticks, start=start, interval=interval)
+        colony.apply()
+        return ticks
+
+    @staticmethod
+    def replay(ticks: int, start: int, interval: int) -> None:
+        # The same ticks one at a time, for when numpy is missing
+        # Nothing is rendered and the colony is saved once at the end
+        listeners = Engine.listeners
+        Engine.listeners = {}
+        Engine.pending = {}
+
+        try:
+            with Ants.batch():
+                for tick in range(ticks):
+                    Utils.clock = start + tick * interval
+                    Engine.tick()
+
+                Utils.clock = None
+                Engine.finish_replay()
+        finally:
+            Utils.clock = None
+            Engine.pending = None
+            Engine.listeners = listeners
+
+    @staticmethod
+    def finish_replay() -> None:
+        # Only the last status of each ant is ever shown, so the text is
+        # made once for the ones still in the colony
+        for ant, value in (Engine.pending or {}).values():
+            if ant.slot < 0:
+                continue
+
+            status, _ = Engine.describe(value)
+            ant.status = status.strip()
+            Ants.touch(ant)
+
+            Ants.record(
+                "s", ant.id, ant.status, ant.method, ant.updated, ant.triumph, ant.hits
+            )
+
+    @staticmethod
+    def tick() -> None:
+        ant = Ants.get_next()
+
+        if not ant:
+            return
+
+        if Engine.merge_charge < Config.merge_goal:
+            Engine.merge_charge += 1
+
+        charged = Engine.merge_charge >= Config.merge_goal
+        value = Engine.choose(Settings.merge and charged)
+
+        if value is None:
+            return
+
+        if value == Opts.merge.value:
+            if Ants.merge():
+                Engine.merge_charge = 0
+                return
+
+            value = Engine.choose(False)
+
+            if value is None:
+                return
+
+        status, method = Engine.make_status(ant, value)
+        Ants.set_status(ant, status, method)
+
+    @staticmethod
+    def choose(merge: bool) -> int | None:
+        table = Opts.get_table(merge)
+
+        if not table:
+            return None
+
+        return table.choose()
+
+    @staticmethod
+    def make_status(ant: Ant, value: int) -> tuple[str, str]:
+        if value == Opts.triumph.value:
+            ant.triumph += 1
+        elif value == Opts.hit.value:
+            ant.hits += 1
+
+        if Engine.pending is not None:
+            Engine.pending[ant.id] = (ant, value)
+            return "", Engine.get_method(value)
+
+        return Engine.describe(value)
+
+    @staticmethod
+    def get_method(value: int) -> str:
+        for opt in (Opts.triumph, Opts.hit, Opts.travel, Opts.think, Opts.words):
+            if opt.value == value:
+                return opt.method
+
+        return "unknown"
+
+    @staticmethod
+    def describe(value: int) -> tuple[str, str]:
+        status = ""
+        method = ""
+
+        if value == Opts.triumph.value:
+            method = Opts.triumph.method
+
+        elif value == Opts.hit.value:
+            method = Opts.hit.method
+
+        elif value == Opts.travel.value:
+            status = Utils.random_country([])
+            method = Opts.travel.method
+
+        elif value == Opts.think.value:
+            method = Opts.think.method
+            n = random.choices([1, 2, 3], weights=[1, 2, 2])[0]
+
+            if n == 1:
+                status = Utils.names.random()
+            elif n == 2:
+                status = Utils.random_emoji(3)
+            elif n == 3:
+                status = Utils.random_word(noun=True, adj=False)
+
+        elif value == Opts.words.value:
+            method = Opts.words.method
+            n = random.randint(1, 4)
+            status = Sentences.get(n)
+
+        else:
+            status = "???"
+            method = "unknown"
+
+        return status, method
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, TYPE_CHECKING
+
+from PySide6.QtWidgets import QListView  # type: ignore
+from PySide6.QtWidgets import QStyledItemDelegate
+from PySide6.QtWidgets import QStyleOptionViewItem
+from PySide6.QtWidgets import QAbstractItemView
+from PySide6.QtWidgets import QToolTip
+from PySide6.QtGui import QPainter  # type: ignore
+from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QColor
+from PySide6.QtGui import QFont
+from PySide6.QtGui import QFontMetrics
+from PySide6.QtGui import QMouseEvent
+from PySide6.QtGui import QHelpEvent
+from PySide6.QtCore import QAbstractListModel  # type: ignore
+from PySide6.QtCore import QModelIndex
+from PySide6.QtCore import QPersistentModelIndex
+from PySide6.QtCore import QEasingCurve
+from PySide6.QtCore import QEvent
+from PySide6.QtCore import QTimer
+from PySide6.QtCore import QRect
+from PySide6.QtCore import QSize
+from PySide6.QtCore import Qt
+
+from .config import Config
+from .args import Args
+from .portraits import Portraits
+from .query import Query
+from .query import Fields
+
+if TYPE_CHECKING:
+    from .ants import Ant
+
+
+ModelIndex = QModelIndex | QPersistentModelIndex
+
+# Invisible Left-To-Right Mark
+ltr = "\u200e"
+
+
+class Row:
+    # What one entry of the feed shows, kept as it was when it came in
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.kind = "ant"
+        self.title = ""
+        self.message = ""
+        self.path: Path | None = None
+        self.color: tuple[int, int, int] | None = None
+        self.tooltip = ""
+        self.ant: Ant | None = None
+        self.added = 0.0
+        self.fading = False
+        self.fields: Fields = {}
+        self.hidden = False
+
+    def make_fields(self) -> None:
+        # What the filter looks at, as it was when the row came in
+        ant = self.ant
+
+        if not ant:
+            self.fields = {}
+            return
+
+        self.fields = Query.fields(
+            ant.id,
+            ant.name,
+            ant.method,
+            ant.triumph,
+            ant.hits,
+            self.title,
+            self.message,
+        )
+
+    def get_opacity(self) -> float:
+        if not self.fading:
+            return 1.0
+
+        elapsed = (time.monotonic() - self.added) * 1000
+        progress = elapsed / Config.fade_duration
+
+        if progress >= 1:
+            self.fading = False
+            return 1.0
+
+        return float(
+            QEasingCurve(QEasingCurve.Type.InOutQuad).valueForProgress(progress)
+        )
+
+
+class FeedModel(QAbstractListModel):  # type: ignore
+    # Newest rows first, only the last max_updates are kept
+    # Rows that fall off the end are handed out again by make_row
+    def __init__(self) -> None:
+        super().__init__()
+        self.rows: list[Row] = []
+        self.spare: list[Row] = []
+        self.hits = 0
+        self.misses = 0
+
+    def rowCount(self, parent: ModelIndex = QModelIndex()) -> int:  # noqa: B008
+        if parent.isValid():
+            return 0
+
+        return len(self.rows)
+
+    def data(self, index: ModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        row = self.rows[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row.title
+        if role == Qt.ItemDataRole.UserRole:
+            return row
+
+        return None
+
+    def make_row(self) -> Row:
+        if self.spare:
+            self.hits += 1
+            return self.spare.pop()
+
+        self.misses += 1
+        return Row()
+
+    def add(self, row: Row) -> None:
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.rows.insert(0, row)
+        self.endInsertRows()
+        size = len(self.rows)
+
+        if size > Config.max_updates:
+            self.beginRemoveRows(QModelIndex(), Config.max_updates, size - 1)
+            self.release(self.rows[Config.max_updates :])
+            del self.rows[Config.max_updates :]
+            self.endRemoveRows()
+
+    def release(self, rows: list[Row]) -> None:
+        # Let go of the ants so they can be freed
+        for row in rows:
+            row.reset()
+
+        self.spare.extend(rows)
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self.release(self.rows)
+        self.rows = []
+        self.endResetModel()
+
+
+class FeedDelegate(QStyledItemDelegate):  # type: ignore
+    # Paints the rows, so only the ones on screen cost anything
+    def __init__(self, view: FeedView) -> None:
+        super().__init__(view)
+        self.view = view
+
+    def get_row(self, index: ModelIndex) -> Row:
+        row: Row = index.data(Qt.ItemDataRole.UserRole)
+        return row
+
+    def get_pixmap(self, row: Row) -> QPixmap | None:
+        if (not Args.images) or (not row.path):
+            return None
+
+        ratio = self.view.devicePixelRatioF()
+        return Portraits.get(row.path, ratio, row.color)
+
+    def image_rect(self, rect: QRect, row: Row) -> QRect:
+        pixmap = self.get_pixmap(row)
+
+        if not pixmap:
+            return QRect()
+
+        size = pixmap.deviceIndependentSize().toSize()
+        return QRect(rect.left(), rect.top(), size.width(), size.height())
+
+    def text_left(self, rect: QRect, row: Row) -> int:
+        image = self.image_rect(rect, row)
+
+        if image.isNull():
+            return rect.left()
+
+        return image.right() + 1 + Config.feed_margin
+
+    def title_font(self, option: QStyleOptionViewItem) -> QFont:
+        font = QFont(option.font)
+        font.setBold(True)
+        return font
+
+    def text_height(self, font: QFont, width: int, text: str) -> int:
+        metrics = QFontMetrics(font)
+        flags = Qt.TextFlag.TextWordWrap
+        return int(metrics.boundingRect(QRect(0, 0, width, 0), flags, text).height())
+
+    def text_width(self, rect: QRect, row: Row) -> int:
+        return max(1, rect.right() + 1 - Config.space_1 - self.text_left(rect, row))
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: ModelIndex) -> QSize:
+        row = self.get_row(index)
+        width = self.view.viewport().width()
+        rect = QRect(0, 0, width, 0)
+        margin = Config.feed_margin
+
+        if row.kind == "message":
+            height = QFontMetrics(option.font).height() + margin * 2
+            return QSize(width, height + margin)
+
+        text_width = self.text_width(rect, row)
+        title = self.text_height(self.title_font(option), text_width, ltr + row.title)
+        message = self.text_height(option.font, text_width, ltr + row.message)
+        height = max(self.image_rect(rect, row).height(), title + message + margin * 2)
+        return QSize(width, height + margin)
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: ModelIndex
+    ) -> None:
+        row = self.get_row(index)
+        painter.save()
+        painter.setOpacity(row.get_opacity())
+        painter.setPen(QColor(Config.text_color))
+
+        if row.kind == "message":
+            self.paint_message(painter, option, row)
+        else:
+            self.paint_ant(painter, option, row)
+
+        painter.restore()
+
+    def paint_ant(
+        self, painter: QPainter, option: QStyleOptionViewItem, row: Row
+    ) -> None:
+        rect = option.rect
+        pixmap = self.get_pixmap(row)
+        margin = Config.feed_margin
+
+        if pixmap:
+            painter.drawPixmap(rect.topLeft(), pixmap)
+
+        left = self.text_left(rect, row)
+        width = self.text_width(rect, row)
+        flags = Qt.AlignmentFlag.AlignLeft | Qt.TextFlag.TextWordWrap
+        title_font = self.title_font(option)
+        title = ltr + row.title
+        title_height = self.text_height(title_font, width, title)
+        top = rect.top() + margin
+
+        painter.setFont(title_font)
+        painter.drawText(QRect(left, top, width, title_height), flags, title)
+
+        message = ltr + row.message
+        message_height = self.text_height(option.font, width, message)
+        top += title_height
+
+        painter.setFont(option.font)
+        painter.drawText(QRect(left, top, width, message_height), flags, message)
+
+    def paint_message(
+        self, painter: QPainter, option: QStyleOptionViewItem, row: Row
+    ) -> None:
+        # The text centered between two lines
+        rect = option.rect
+        margin = Config.feed_margin
+        metrics = QFontMetrics(option.font)
+        text_width = metrics.horizontalAdvance(row.message)
+        height = metrics.height()
+        top = rect.top() + margin
+        middle = top + height // 2
+        gap = Config.space_1 * 2
+        left = rect.left() + (rect.width() - text_width) // 2
+
+        painter.setFont(option.font)
+        painter.drawText(QRect(left, top, text_width, height), 0, row.message)
+        painter.fillRect(
+            rect.left(), middle - 1, left - gap - rect.left(), 2, Qt.GlobalColor.white
+        )
+        right = left + text_width + gap
+        painter.fillRect(
+            right, middle - 1, rect.right() + 1 - right, 2, Qt.GlobalColor.white
+        )
+
+    def helpEvent(
+        self,
+        event: QHelpEvent,
+        view: QAbstractItemView,
+        option: QStyleOptionViewItem,
+        index: ModelIndex,
+    ) -> bool:
+        # Only the portraits have tooltips
+        if event.type() != QEvent.Type.ToolTip:
+            return bool(super().helpEvent(event, view, option, index))
+
+        row = self.get_row(index)
+
+        if row.tooltip and self.image_rect(option.rect, row).contains(event.pos()):
+            QToolTip.showText(event.globalPos(), row.tooltip, view)
+        else:
+            QToolTip.hideText()
+
+        return True
+
+
+class FeedView(QListView):  # type: ignore
+    def __init__(self) -> None:
+        super().__init__()
+        self.feed = FeedModel()
+        self.delegate = FeedDelegate(self)
+        self.setModel(self.feed)
+        self.setItemDelegate(self.delegate)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(False)
+        self.setWordWrap(True)
+        self.setFrameShape(QListView.Shape.NoFrame)
+
+        # Repaints the rows that are still fading in
+        self.fading: set[Row] = set()
+        self.fade_timer = QTimer()
+        self.fade_timer.setInterval(Config.fade_frame)
+        self.fade_timer.timeout.connect(self.on_fade)
+
+    def add(self, row: Row) -> None:
+        row.added = time.monotonic()
+
+        if row.fading:
+            self.fade(row)
+
+        self.feed.add(row)
+
+    def clear(self) -> None:
+        self.fading.clear()
+        self.fade_timer.stop()
+        self.feed.clear()
+
+    def fade(self, row: Row) -> None:
+        self.fading.add(row)
+
+        if not self.fade_timer.isActive():
+            self.fade_timer.start()
+
+    def on_fade(self) -> None:
+        self.fading = {row for row in self.fading if row.get_opacity() < 1}
+        self.viewport().update()
+
+        if not self.fading:
+            self.fade_timer.stop()
+
+    def get_row(self, index: ModelIndex) -> Row | None:
+        if not index.isValid():
+            return None
+
+        return self.delegate.get_row(index)
+
+    def event(self, e: QEvent) -> bool:
+        # Moved to a screen with another scale
+        if e.type() == QEvent.Type.DevicePixelRatioChange:
+            Portraits.clear()
+            self.viewport().update()
+
+        return bool(super().event(e))
+
+    def mousePressEvent(self, e: QMouseEvent) -> None:
+        from .game import Game
+
+        pos = e.position().toPoint()
+        index = self.indexAt(pos)
+        row = self.get_row(index)
+
+        if row and row.ant:
+            rect = self.delegate.image_rect(self.visualRect(index), row)
+
+            if rect.contains(pos):
+                Game.image_action(e, row.ant)
+                return
+
+        super().mousePressEvent(e)
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-from PySide6.QtWidgets import QLayoutItem, QLayout  # type: ignore
 from PySide6.QtGui import QKeyEvent  # type: ignore
 from PySide6.QtCore import QTimer  # type: ignore
-from PySide6.QtWidgets import QLabel, QLineEdit, QPushButton
 
 from .config import Config
 from .window import Window
+from .feed import Row
+from .query import Query
 
 
 class Filter:
     debouncer: QTimer
 
+    # The query every row in the view has been tested with
+    query: Query = Query("")
+
     @staticmethod
     def prepare() -> None:
         Filter.debouncer = QTimer()
@@ -19,10 +22,6 @@ class Filter:
         Filter.debouncer.setInterval(Config.filter_debouncer_delay)
         Filter.debouncer.timeout.connect(Filter.do_filter)
 
-    @staticmethod
-    def get_value() -> str:
-        return str(Window.filter.text()).lower().strip()
-
     @staticmethod
     def set_value(value: str) -> None:
         Window.filter.setText(value)
@@ -41,85 +40,41 @@ class Filter:
     @staticmethod
     def do_filter() -> None:
         Filter.debouncer.stop()
-        value = Filter.get_value()
-
-        for i in range(Window.view.count()):
-            item = Window.view.itemAt(i)
-            text = Filter.get_text(item)
-            hide = True
-
-            for txt in text:
-                if value in txt:
-                    hide = False
-                    break
-
-            widget = item.widget()
-
-            if widget:
-                if hide:
-                    widget.hide()
-                else:
-                    widget.show()
-
-    @staticmethod
-    def get_text(item: QLayoutItem) -> list[str]:
-        text: list[str] = []
-        wid = item.widget()
-
-        if not wid:
-            return text
-
-        layout: QLayout | None = wid.layout()
-
-        if not layout:
-            return text
-
-        for i in range(layout.count()):
-            an_item = layout.itemAt(i)
-
-            if not an_item:
+        query = Query(str(Window.filter.text()))
+        last = Filter.query
+        Filter.query = query
+
+        if query.key == last.key:
+            return
+
+        # A narrower query can only hide more rows and a wider one can
+        # only show more, so the other rows keep their state
+        if query.narrows(last):
+            check = "shown"
+        elif last.narrows(query):
+            check = "hidden"
+        else:
+            check = "all"
+
+        for i, row in enumerate(Window.view.feed.rows):
+            if (check == "shown") and row.hidden:
                 continue
 
-            widget = an_item.widget()
-
-            if not widget:
-                continue
-
-            name = widget.objectName()
-
-            if name != "view_right":
-                continue
-
-            layout2 = widget.layout()
-
-            if not layout2:
+            if (check == "hidden") and (not row.hidden):
                 continue
 
-            for j in range(layout2.count()):
-                an_item_2 = layout2.itemAt(j)
+            Filter.apply(i, row)
 
-                if not an_item_2:
-                    continue
-
-                wid = an_item_2.widget()
-
-                if not wid:
-                    continue
-
-                name = wid.objectName()
-
-                if not name:
-                    continue
-
-                if (name == "view_title") or (name == "view_message"):
-                    if isinstance(wid, (QLabel, QLineEdit, QPushButton)):
-                        text.append(wid.text().lower())
+    @staticmethod
+    def apply(i: int, row: Row) -> None:
+        hide = not Filter.query.match(row.fields)
 
-        return text
+        if hide != row.hidden:
+            row.hidden = hide
+            Window.view.setRowHidden(i, hide)
 
     @staticmethod
-    def check() -> None:
-        value = Filter.get_value()
-
-        if value:
-            Filter.filter()
+    def check(row: Row) -> None:
+        # New rows go on top
+        if Filter.query:
+            Filter.apply(0, row)
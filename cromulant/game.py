@@ -8,21 +8,10 @@ from pathlib import Path
 from PySide6.QtWidgets import QApplication  # type: ignore
 from typing import ClassVar
 
-from PySide6.QtWidgets import QHBoxLayout
-from PySide6.QtWidgets import QVBoxLayout
-from PySide6.QtWidgets import QLabel
-from PySide6.QtWidgets import QWidget
-from PySide6.QtWidgets import QFrame
 from PySide6.QtWidgets import QMenu
-from PySide6.QtWidgets import QGraphicsOpacityEffect
 from PySide6.QtGui import QCursor  # type: ignore
 from PySide6.QtGui import QMouseEvent
-from PySide6.QtGui import QPixmap
 from PySide6.QtGui import QAction
-from PySide6.QtCore import QPropertyAnimation  # type: ignore
-from PySide6.QtCore import QByteArray
-from PySide6.QtCore import QEasingCurve
-from PySide6.QtCore import QSize
 from PySide6.QtCore import QTimer
 from PySide6.QtCore import Qt
 
@@ -34,362 +23,96 @@ from .ants import Ants
 from .window import Window
 from .window import RestartDialog
 from .settings import Settings
-
-
-class Method:
-    merge = "merge"
-    triumph = "triumph"
-    hit = "hit"
-    travel = "travel"
-    think = "think"
-    words = "words"
-
-
-class Opt:
-    value = 0
-
-    def __init__(self, weight: int, method: str) -> None:
-        self.value = Opt.value
-        self.weight = weight
-        self.method = method
-
-        Opt.value += 1
-
-
-class Opts:
-    merge: Opt
-    triumph: Opt
-    hit: Opt
-    travel: Opt
-    think: Opt
-    words: Opt
-
-    @staticmethod
-    def prepare() -> None:
-        from .args import Args
-
-        Opts.merge = Opt(Args.weight_merge, Method.merge)
-        Opts.triumph = Opt(Args.weight_triumph, Method.triumph)
-        Opts.hit = Opt(Args.weight_hit, Method.hit)
-        Opts.travel = Opt(Args.weight_travel, Method.travel)
-        Opts.think = Opt(Args.weight_think, Method.think)
-        Opts.words = Opt(Args.weight_words, Method.words)
-
-    @staticmethod
-    def opts_score() -> list[Opt]:
-        return [Opts.triumph, Opts.hit]
-
-    @staticmethod
-    def opts_travel() -> list[Opt]:
-        return [Opts.travel]
-
-    @staticmethod
-    def opts_think() -> list[Opt]:
-        return [Opts.think]
-
-    @staticmethod
-    def opts_words() -> list[Opt]:
-        return [Opts.words]
+from .engine import Engine
+from .feed import Row
+from .query import Query
 
 
 class Game:
     timer: QTimer
     playing_song: bool = False
-    merge_charge: int = 0
     speed: str = "paused"
-    animations: ClassVar[list[QPropertyAnimation]] = []
     started: bool = False
     restart_dialog: ClassVar[RestartDialog | None] = None
     simulate_timer: ClassVar[QTimer | None] = None
     simulate_tick: int = 0
     simulate_dir: Path = Path()
+    hatch_timer: ClassVar[QTimer | None] = None
 
     @staticmethod
     def prepare() -> None:
-        Opts.prepare()
+        Engine.prepare()
+        caught_up = Game.catch_up()
+        Engine.on("update", Game.update)
+        Engine.on("info", Game.info)
         Game.timer = QTimer()
-        Game.timer.timeout.connect(Game.get_status)
+        Game.timer.timeout.connect(Engine.tick)
+        Window.speed.setCurrentText(Settings.speed.capitalize())
 
         Game.fill()
         Game.info()
 
+        if caught_up:
+            Game.message(caught_up)
+
         if Args.intro:
             Game.intro()
 
     @staticmethod
-    def update(ant: Ant) -> None:
-        root = QWidget()
-        container = QHBoxLayout()
-        root.setContentsMargins(0, 0, 0, 0)
-        container.setContentsMargins(0, 0, 0, 0)
-
-        if Args.images:
-            image_label = Game.get_image(ant)
-            container.addWidget(image_label)
-
-        right_container = Game.make_right_container(ant)
-        container.addWidget(right_container)
-
-        container.addSpacing(Config.space_1)
-        root.setLayout(container)
-        Game.add_item(root)
-
-    @staticmethod
-    def message(text: str) -> None:
-        root = QWidget()
-        root.setContentsMargins(0, 10, 0, 10)
-
-        container = QHBoxLayout()
-        container.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        left_line = QFrame()
-        left_line.setFrameShape(QFrame.Shape.HLine)
-        left_line.setFrameShadow(QFrame.Shadow.Sunken)
-        left_line.setObjectName("horizontal_line")
-        left_line.setFixedHeight(2)
-        Window.expand_2(left_line)
-
-        label = QLabel(text)
-        label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-
-        right_line = QFrame()
-        right_line.setFrameShape(QFrame.Shape.HLine)
-        right_line.setFrameShadow(QFrame.Shadow.Sunken)
-        right_line.setObjectName("horizontal_line")
-        right_line.setFixedHeight(2)
-        Window.expand_2(right_line)
-
-        container.addWidget(left_line)
-        container.addWidget(label)
-        container.addWidget(right_line)
-
-        container.setSpacing(Config.space_1 * 2)
-        root.setLayout(container)
-        Game.add_item(root)
-
-    @staticmethod
-    def add_item(item: QWidget) -> None:
-        from .filter import Filter
+    def catch_up() -> str:
+        if not Args.catch_up:
+            return ""
 
-        animation: QPropertyAnimation | None = None
+        # Nothing is listening yet so the updates are not rendered
+        ticks = Engine.catch_up()
 
-        if Game.started and Args.fade and Args.simulate == 0:
-            animation = Game.add_fade(item)
+        if not ticks:
+            return ""
 
-        Window.view.insertWidget(0, item)
-
-        if animation:
-            animation.start()
-
-        while Window.view.count() > Config.max_updates:
-            layout_item = Window.view.takeAt(Window.view.count() - 1)
-            widget = layout_item.widget()
-
-            if layout_item:
-                if widget:
-                    widget.deleteLater()
-                elif layout_item.layout():
-                    Window.delete_layout(layout_item.layout())
-
-        Filter.check()
+        word = Utils.singular_or_plural(ticks, "update", "updates")
+        return f"Caught up on {ticks} {word}"
 
     @staticmethod
-    def make_right_container(ant: Ant) -> QWidget:
-        if ant.method == "hatched":
-            title = "Hatched"
-            message = f"{ant.name} is born"
-        elif ant.method == "terminated":
-            title = "Terminated"
-            message = f"{ant.name} is gone"
-        else:
-            title = ant.name
-            message = ant.get_status()
-
-        root = QWidget()
-        root.setObjectName("view_right")
-        container = QVBoxLayout()
-        container.setAlignment(Qt.AlignmentFlag.AlignTop)
-
-        # Prepend the invisible Left-To-Right Mark
-        title_label = QLabel(f"\u200e{title}")
-
-        title_label.setTextInteractionFlags(
-            Qt.TextInteractionFlag.TextSelectableByMouse
-        )
-
-        title_label.setStyleSheet("font-weight: bold;")
-        title_label.setWordWrap(True)
-        title_label.setObjectName("view_title")
-        title_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-
-        Window.expand(title_label)
-
-        # Prepend the invisible Left-To-Right Mark (\u200E)
-        message_label = QLabel(f"\u200e{message}")
-
-        message_label.setTextInteractionFlags(
-            Qt.TextInteractionFlag.TextSelectableByMouse
-        )
-
-        message_label.setWordWrap(True)
-        message_label.setObjectName("view_message")
-        message_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-
-        Window.expand(message_label)
-
-        container.addWidget(title_label)
-        container.addWidget(message_label)
-        root.setLayout(container)
+    def update(ant: Ant) -> None:
+        row = Window.view.feed.make_row()
+        row.ant = ant
 
-        return root
+        row.title, row.message = ant.get_text()
 
-    @staticmethod
-    def get_image(ant: Ant) -> QLabel:
         if ant.method == "hatched":
-            path = Config.hatched_image_path
+            row.path = Config.hatched_image_path
         elif ant.method == "terminated":
-            path = Config.terminated_image_path
+            row.path = Config.terminated_image_path
         elif ant == Ants.top:
-            path = Config.top_image_path
+            row.path = Config.top_image_path
         else:
-            path = Config.status_image_path
+            row.path = Config.status_image_path
 
         if ant.method == "triumph":
-            color = Config.triumph_color
+            row.color = Config.triumph_color
         elif ant.method == "hit":
-            color = Config.hit_color
-        else:
-            color = None
-
-        tooltip = ant.tooltip()
-        image_label = QLabel()
-        image_label.setObjectName("view_image")
-        pixmap = QPixmap(str(path))
-
-        scaled_pixmap = pixmap.scaled(
-            Config.image_size,
-            pixmap.height(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
+            row.color = Config.hit_color
 
-        image_label.setPixmap(scaled_pixmap)
-        adjusted_size = scaled_pixmap.size() + QSize(4, 4)
-        image_label.setFixedSize(adjusted_size)
-
-        if color:
-            rgb = Utils.get_rgb(color)
-
-            style = f"""
-            QLabel#view_image {{
-                border: 2px solid {rgb};
-            }}
-            """
-
-            image_label.setStyleSheet(style)
-
-        if tooltip:
-            image_label.setToolTip(tooltip)
-
-        image_label.mousePressEvent = lambda event: Game.image_action(event, ant)
-        return image_label
+        row.tooltip = ant.tooltip()
+        Game.add_item(row)
 
     @staticmethod
-    def get_status() -> None:
-        ant = Ants.get_next()
-
-        if not ant:
-            return
-
-        opts: list[Opt] = []
-
-        opts.extend(Opts.opts_score())
-
-        if Settings.travel_enabled:
-            opts.extend(Opts.opts_travel())
-
-        if Settings.think_enabled:
-            opts.extend(Opts.opts_think())
-
-        if Settings.words_enabled:
-            opts.extend(Opts.opts_words())
-
-        if not opts:
-            return
-
-        values = [opt.value for opt in opts]
-        weights = [opt.weight for opt in opts]
-
-        if Game.merge_charge < Config.merge_goal:
-            Game.merge_charge += 1
-
-        if Settings.merge:
-            only_merge = (len(values) == 1) and (values[0] == Opts.merge.value)
-
-            if (Game.merge_charge >= Config.merge_goal) or only_merge:
-                opt = Opts.merge
-                values.insert(0, opt.value)
-                weights.insert(0, opt.weight)
-
-        value = random.choices(values, weights=weights, k=1)[0]
-
-        if value == Opts.merge.value:
-            if Ants.merge():
-                Game.merge_charge = 0
-                return
-
-            value = Opts.words.value
-
-        status = ""
-        method = ""
-
-        is_score_event = (value == Opts.triumph.value) or (value == Opts.hit.value)
-
-        if is_score_event:
-            if not Settings.score_enabled:
-                Game.get_status()
-                return
+    def message(text: str) -> None:
+        row = Window.view.feed.make_row()
+        row.kind = "message"
+        row.message = text
+        Game.add_item(row)
 
-            if value == Opts.triumph.value:
-                ant.triumph += 1
-                method = Opts.triumph.method
-            else:
-                ant.hits += 1
-                method = Opts.hit.method
-
-        elif value == Opts.travel.value:
-            status = Utils.random_country([])
-            method = Opts.travel.method
-
-        elif value == Opts.think.value:
-            method = Opts.think.method
-            n = random.choices([1, 2, 3], weights=[1, 2, 2])[0]
-
-            if n == 1:
-                status = Utils.random_name([], Ants.get_names())
-            elif n == 2:
-                status = Utils.random_emoji(3)
-            elif n == 3:
-                status = Utils.random_word(noun=True, adj=False)
-
-        elif value == Opts.words.value:
-            method = Opts.words.method
-            n = random.randint(1, 4)
-
-            if n == 1:
-                status = Utils.words_1()
-            elif n == 2:
-                status = Utils.words_2()
-            elif n == 3:
-                status = Utils.words_3()
-            elif n == 4:
-                status = Utils.words_4()
+    @staticmethod
+    def add_item(row: Row) -> None:
+        from .filter import Filter
 
-        else:
-            status = "???"
-            method = "unknown"
+        if Game.started and Args.fade and Args.simulate == 0:
+            row.fading = True
 
-        Ants.set_status(ant, status, method)
+        row.make_fields()
+        Window.view.add(row)
+        Filter.check(row)
 
     @staticmethod
     def fill() -> None:
@@ -398,7 +121,8 @@ class Game:
 
         ants = sorted(Ants.ants, key=lambda ant: ant.updated)
 
-        for ant in ants:
+        # Only the newest ones fit in the view
+        for ant in ants[-Config.max_updates :]:
             Game.update(ant)
 
     @staticmethod
@@ -410,23 +134,13 @@ class Game:
             return
 
         speed = Settings.speed
+        msecs = Engine.get_interval(speed)
 
-        if speed == "fast":
-            minutes = (Args.fast_seconds or Config.fast_seconds) / 60
-        elif speed == "normal":
-            minutes = Args.normal_minutes or Config.normal_minutes
-        elif speed == "slow":
-            minutes = Args.slow_minutes or Config.slow_minutes
-        else:
+        if not msecs:
             Game.speed = "paused"
             return
 
         Game.speed = speed
-        msecs = int(minutes * 60 * 1000)
-
-        if msecs < 1000:
-            msecs = 1000
-
         Game.timer.setInterval(msecs)
         Game.timer.start()
 
@@ -484,9 +198,9 @@ class Game:
             Game.finish_simulation()
             return
 
-        Game.get_status()
+        Engine.tick()
         QApplication.processEvents()
-        pixmap = Window.scroll_area.grab()
+        pixmap = Window.view.grab()
         frame_path = Game.simulate_dir / f"frame_{Game.simulate_tick:04d}.png"
         pixmap.save(str(frame_path))
         Game.simulate_tick += 1
@@ -579,6 +293,10 @@ class Game:
     @staticmethod
     def restart() -> None:
         sizes = ["25", "50", "100", "250"]
+
+        if str(Args.population) not in sizes:
+            sizes.append(str(Args.population))
+            sizes.sort(key=int)
         defindex = 0
 
         for i, opt in enumerate(sizes):
@@ -612,9 +330,60 @@ class Game:
     def perform_restart(size: int) -> None:
         Game.started = False
         Game.timer.stop()
-        Game.merge_charge = 0
+        Game.stop_hatching()
+        Engine.merge_charge = 0
         Window.clear_view()
+
+        if size > Config.hatch_chunk:
+            Game.hatch_chunks(size)
+            return
+
         Ants.populate(size)
+        Game.end_restart()
+
+    @staticmethod
+    def hatch_chunks(size: int) -> None:
+        # Big colonies hatch a chunk at a time between events
+        # They are saved and shown once all of them are in
+        Ants.begin_batch()
+        Ants.clear()
+        timer = QTimer()
+        timer.setInterval(0)
+
+        def hatch() -> None:
+            num = min(size - len(Ants.ants), Config.hatch_chunk)
+            Ants.hatch(num, render=False)
+            Window.info.setText(f"Hatching ants: {len(Ants.ants)} / {size}")
+
+            if len(Ants.ants) < size:
+                return
+
+            Game.stop_hatching()
+
+            if Settings.verbose:
+                for ant in Ants.ants[-Config.max_updates :]:
+                    Game.update(ant)
+
+            Game.end_restart()
+
+        timer.timeout.connect(hatch)
+        Game.hatch_timer = timer
+        timer.start()
+
+    @staticmethod
+    def stop_hatching() -> None:
+        timer = Game.hatch_timer
+
+        if not timer:
+            return
+
+        timer.stop()
+        timer.deleteLater()
+        Game.hatch_timer = None
+        Ants.end_batch()
+
+    @staticmethod
+    def end_restart() -> None:
         Window.to_top()
         Game.intro()
         Game.start_loop()
@@ -718,7 +487,7 @@ class Game:
 
     @staticmethod
     def force_update() -> None:
-        Game.get_status()
+        Engine.tick()
         Game.start_loop()
 
     @staticmethod
@@ -746,31 +515,14 @@ class Game:
     def filter_top() -> None:
         from .filter import Filter
 
-        value = Filter.get_value()
         ant = Ants.top
 
         if not ant:
             return
 
-        if value == ant.name.lower():
+        value = f'name:"{ant.name}"'
+
+        if Query(str(Window.filter.text())).key == Query(value).key:
             Filter.clear()
         else:
-            Filter.set_value(ant.name)
-
-    @staticmethod
-    def add_fade(item: QWidget) -> QPropertyAnimation:
-        opacity = QGraphicsOpacityEffect(item)
-        item.setGraphicsEffect(opacity)
-        animation = QPropertyAnimation(opacity, QByteArray(b"opacity"))
-        animation.setDuration(Config.fade_duration)
-        animation.setStartValue(0)
-        animation.setEndValue(1)
-        animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-
-        def on_finish() -> None:
-            item.setGraphicsEffect(None)  # pyright: ignore
-            Game.animations.remove(animation)
-
-        animation.finished.connect(on_finish)
-        Game.animations.append(animation)
-        return animation
+            Filter.set_value(value)
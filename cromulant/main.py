@@ -18,6 +18,8 @@ from .game import Game
 from .settings import Settings
 from .filter import Filter
 from .args import Args
+from .writer import Writer
+from .sentences import Sentences
 
 
 def main() -> None:
@@ -45,7 +47,9 @@ def main() -> None:
     fp.write(str(os.getpid()))
     fp.flush()
 
+    Writer.prepare()
     Utils.prepare()
+    Sentences.prepare()
     Window.prepare()
     Settings.prepare()
     Ants.prepare()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import mmap
+import random
+import struct
+from array import array
+from pathlib import Path
+from collections.abc import Container
+
+
+class NameFile:
+    # Names read in place from a text file with one name per line
+    # The companion index holds the offset of every line, so a name
+    # is a single seek and only the names in use become strings
+
+    # Magic, size and mtime of the names file, number of names
+    header = struct.Struct("<4sQqQ")
+    magic = b"CRMN"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.used: set[str] = set()
+
+        self.data: mmap.mmap | bytes = b""
+        self.offsets: array[int] = array("Q")
+
+        # Empty files can't be mapped and have no names anyway
+        if not path.stat().st_size:
+            return
+
+        with path.open("rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.offsets = NameFile.get_index(path, self.data)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.used
+
+    @staticmethod
+    def get_index(path: Path, data: mmap.mmap) -> array[int]:
+        index_path = path.with_name(f"{path.name}.idx")
+        stat = path.stat()
+        offsets = array("Q")
+
+        try:
+            raw = index_path.read_bytes()
+            magic, size, mtime, count = NameFile.header.unpack_from(raw)
+
+            if (magic, size, mtime) == (NameFile.magic, stat.st_size, stat.st_mtime_ns):
+                offsets.frombytes(raw[NameFile.header.size :])
+
+                if len(offsets) == count:
+                    return offsets
+        except (OSError, struct.error, ValueError):
+            pass
+
+        # Missing or stale, find where every non empty line starts
+        offsets = array("Q")
+        start = 0
+        end = len(data)
+
+        while start < end:
+            newline = data.find(b"\n", start)
+
+            if newline == -1:
+                newline = end
+
+            if data[start:newline].strip():
+                offsets.append(start)
+
+            start = newline + 1
+
+        header = NameFile.header.pack(
+            NameFile.magic, stat.st_size, stat.st_mtime_ns, len(offsets)
+        )
+
+        try:
+            index_path.write_bytes(header + offsets.tobytes())
+        except OSError:
+            pass
+
+        return offsets
+
+    def name(self, index: int) -> str:
+        start = self.offsets[index]
+        end = self.data.find(b"\n", start)
+
+        if end == -1:
+            end = len(self.data)
+
+        return self.data[start:end].decode("utf-8").strip()
+
+    def take(self, name: str) -> None:
+        self.used.add(name)
+
+    def release(self, name: str) -> None:
+        self.used.discard(name)
+
+    def draw(self, ignore: Container[str] = ()) -> str:
+        # The file is much bigger than the colony, collisions are rare
+        for _ in range(10):
+            if not self.offsets:
+                break
+
+            name = self.name(random.randrange(len(self.offsets)))
+
+            if (name not in self.used) and (name not in ignore):
+                self.take(name)
+                return name
+
+        return ""
+
+    def draw_many(self, num: int, ignore: Container[str] = ()) -> list[str]:
+        names: list[str] = []
+
+        # Drawn again for the ones that were skipped
+        for _ in range(10):
+            need = min(num - len(names), len(self.offsets))
+
+            if need <= 0:
+                break
+
+            for index in random.sample(range(len(self.offsets)), need):
+                name = self.name(index)
+
+                # Repeated lines are skipped too
+                if (name not in self.used) and (name not in ignore):
+                    self.take(name)
+                    names.append(name)
+
+        return names
+
+    def random(self) -> str:
+        if not self.offsets:
+            return ""
+
+        return self.name(random.randrange(len(self.offsets)))
+
+    def sample(self, num: int) -> list[str]:
+        picked = random.sample(range(len(self.offsets)), min(num, len(self.offsets)))
+        return [self.name(index) for index in picked]
+
+    def reset(self) -> None:
+        self.used = set()
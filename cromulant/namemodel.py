@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import re
+import random
+
+
+class NameModel:
+    # Letter chains learned from the words in the names list
+    # Each state maps to the letters that followed it, repeated as
+    # often as they did, so every step is a single random pick
+
+    # Bumped when cached tables need to be trained again
+    version = 2
+
+    order = 2
+    start = "^"
+    end = "$"
+    min_length = 3
+    max_length = 10
+
+    def __init__(self, table: dict[str, str] | None = None) -> None:
+        self.table: dict[str, str] = table or {}
+
+    def __bool__(self) -> bool:
+        return bool(self.table)
+
+    @staticmethod
+    def train(names: list[str]) -> NameModel:
+        followers: dict[str, list[str]] = {}
+
+        for name in names:
+            for word in re.findall(r"[^\W\d_]+", name):
+                if len(word) < NameModel.min_length:
+                    continue
+
+                state = NameModel.start * NameModel.order
+
+                for char in word.lower() + NameModel.end:
+                    followers.setdefault(state, []).append(char)
+                    state = state[1:] + char
+
+        return NameModel({state: "".join(chars) for state, chars in followers.items()})
+
+    def word(self) -> str:
+        # Walks that end too soon or run too long are thrown away
+        for _ in range(10):
+            state = NameModel.start * NameModel.order
+            chars: list[str] = []
+
+            while len(chars) <= NameModel.max_length:
+                char = random.choice(self.table.get(state) or NameModel.end)
+
+                if char == NameModel.end:
+                    if len(chars) >= NameModel.min_length:
+                        return "".join(chars)
+
+                    break
+
+                chars.append(char)
+                state = state[1:] + char
+
+        return ""
+
+    def name(self, num_words: int = 2) -> str:
+        words = [self.word() for _ in range(num_words)]
+
+        if not all(words):
+            return ""
+
+        return " ".join(word.capitalize() for word in words)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Container
+
+
+class NamePool:
+    # The names before self.free are available, the rest are in use
+    # Names that didn't come from the list are dropped when released
+
+    def __init__(self, names: list[str] | None = None) -> None:
+        self.names: list[str] = []
+        self.index: dict[str, int] = {}
+        self.extra: set[str] = set()
+        self.free = 0
+
+        for name in names or []:
+            if name not in self.index:
+                self.index[name] = len(self.names)
+                self.names.append(name)
+
+        self.free = len(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def swap(self, a: int, b: int) -> None:
+        names = self.names
+        names[a], names[b] = names[b], names[a]
+        self.index[names[a]] = a
+        self.index[names[b]] = b
+
+    def take(self, name: str) -> None:
+        pos = self.index.get(name)
+
+        if pos is None:
+            self.extra.add(name)
+            self.index[name] = len(self.names)
+            self.names.append(name)
+        elif pos < self.free:
+            self.free -= 1
+            self.swap(pos, self.free)
+
+    def release(self, name: str) -> None:
+        pos = self.index.get(name)
+
+        if (pos is None) or (pos < self.free):
+            return
+
+        if name in self.extra:
+            self.swap(pos, len(self.names) - 1)
+            self.names.pop()
+            del self.index[name]
+            self.extra.discard(name)
+        else:
+            self.swap(pos, self.free)
+            self.free += 1
+
+    def draw(self, ignore: Container[str] = ()) -> str:
+        # Ignored names are rare, give up after a few tries
+        for _ in range(10):
+            if not self.free:
+                break
+
+            name = self.names[random.randrange(self.free)]
+
+            if name not in ignore:
+                self.take(name)
+                return name
+
+        return ""
+
+    def draw_many(self, num: int, ignore: Container[str] = ()) -> list[str]:
+        # Sampled as positions, which take() doesn't disturb until the
+        # names are read, and drawn again for the ignored ones
+        names: list[str] = []
+
+        for _ in range(10):
+            need = min(num - len(names), self.free)
+
+            if need <= 0:
+                break
+
+            picked = [self.names[i] for i in random.sample(range(self.free), need)]
+
+            for name in picked:
+                if name not in ignore:
+                    self.take(name)
+                    names.append(name)
+
+        return names
+
+    def random(self) -> str:
+        if not self.names:
+            return ""
+
+        return random.choice(self.names)
+
+    def sample(self, num: int) -> list[str]:
+        # Only names from the list, extras are mixed in so draw enough
+        # to make up for them
+        size = min(num + len(self.extra), len(self.names))
+        picked = [self.names[i] for i in random.sample(range(len(self.names)), size)]
+        return [name for name in picked if name not in self.extra][:num]
+
+    def reset(self) -> None:
+        if self.extra:
+            self.names = [name for name in self.names if name not in self.extra]
+            self.index = {name: i for i, name in enumerate(self.names)}
+            self.extra = set()
+
+        self.free = len(self.names)
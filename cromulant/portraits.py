@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import ClassVar
+
+from PySide6.QtGui import QPixmap  # type: ignore
+from PySide6.QtGui import QPainter
+from PySide6.QtGui import QColor
+from PySide6.QtGui import QPen
+from PySide6.QtCore import Qt  # type: ignore
+
+from .config import Config
+
+
+Key = tuple[Path, int, float, tuple[int, int, int] | None]
+
+
+class Portraits:
+    # Every row with the same portrait shares one scaled pixmap
+    cache: ClassVar[dict[Key, QPixmap]] = {}
+    sources: ClassVar[dict[Path, QPixmap]] = {}
+
+    @staticmethod
+    def clear() -> None:
+        Portraits.cache = {}
+
+    @staticmethod
+    def get(
+        path: Path, ratio: float, color: tuple[int, int, int] | None = None
+    ) -> QPixmap:
+        size = Config.image_size
+        key = (path, size, ratio, color)
+        pixmap = Portraits.cache.get(key)
+
+        if pixmap is None:
+            pixmap = Portraits.make(path, size, ratio, color)
+            Portraits.cache[key] = pixmap
+
+        return pixmap
+
+    @staticmethod
+    def make(
+        path: Path, size: int, ratio: float, color: tuple[int, int, int] | None
+    ) -> QPixmap:
+        if path not in Portraits.sources:
+            Portraits.sources[path] = QPixmap(str(path))
+
+        source = Portraits.sources[path]
+
+        # Scaled in device pixels so it stays sharp on high dpi screens
+        scaled = source.scaled(
+            round(size * ratio),
+            source.height(),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+
+        scaled.setDevicePixelRatio(ratio)
+        inner = scaled.deviceIndependentSize().toSize()
+
+        # Room for a 2px border around it
+        pixmap = QPixmap(
+            round((inner.width() + 4) * ratio), round((inner.height() + 4) * ratio)
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.drawPixmap(2, 2, scaled)
+
+        if color:
+            pen = QPen(QColor(*color))
+            pen.setWidth(2)
+            painter.setPen(pen)
+            painter.drawRect(1, 1, inner.width() + 2, inner.height() + 2)
+
+        painter.end()
+        return pixmap
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import re
+import operator
+from typing import Any, ClassVar
+from collections.abc import Callable
+
+
+Fields = dict[str, Any]
+Test = Callable[[Fields], bool]
+
+
+class Term:
+    # One word of a query, like ant, name:"foo bar", score>10 or /re+gex/
+    def __init__(self, key: str, test: Test, negate: bool, text: str = "") -> None:
+        self.key = f"-{key}" if negate else key
+        self.negate = negate
+
+        if negate:
+            self.test: Test = lambda f: not test(f)
+        else:
+            self.test = test
+
+        # Only plain words have this, for refining
+        self.text = text
+
+    def implies(self, other: Term) -> bool:
+        # If this matches then the other one matches too
+        if self.key == other.key:
+            return True
+
+        if (not self.text) or (not other.text) or (self.negate != other.negate):
+            return False
+
+        if self.negate:
+            return self.text in other.text
+
+        return other.text in self.text
+
+
+class Query:
+    # The filter text parsed once into predicates over the fields of an event
+    # Words are joined with and, groups of words with or
+
+    numbers = ("id", "score", "triumph", "hits")
+    strings = ("name", "method", "text")
+
+    operators: ClassVar[dict[str, Callable[[Any, Any], bool]]] = {
+        ":": operator.eq,
+        "=": operator.eq,
+        ">": operator.gt,
+        ">=": operator.ge,
+        "<": operator.lt,
+        "<=": operator.le,
+    }
+
+    token = re.compile(r'[-!]?(?:/(?:\\.|[^/\\])*/|(?:"[^"]*"|[^\s"])+)')
+    field = re.compile(r"^([a-z]+)(>=|<=|:|=|>|<)(.+)$")
+
+    def __init__(self, text: str) -> None:
+        self.groups: list[list[Term]] = [[]]
+
+        for token in Query.token.findall(text):
+            if token.lower() == "or":
+                self.groups.append([])
+            else:
+                self.groups[-1].append(Query.make_term(token))
+
+        self.groups = [group for group in self.groups if group]
+        self.key = " or ".join(" ".join(term.key for term in g) for g in self.groups)
+        self.tests = [[term.test for term in group] for group in self.groups]
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    def match(self, fields: Fields) -> bool:
+        if not self.groups:
+            return True
+
+        # Messages are not part of any ant
+        if not fields:
+            return False
+
+        for tests in self.tests:
+            for test in tests:
+                if not test(fields):
+                    break
+            else:
+                return True
+
+        return False
+
+    def narrows(self, other: Query) -> bool:
+        # If this matches then the other one matches too
+        if not other.groups:
+            return True
+
+        if (len(self.groups) != 1) or (len(other.groups) != 1):
+            return self.key == other.key
+
+        terms = self.groups[0]
+        return all(any(t.implies(o) for t in terms) for o in other.groups[0])
+
+    def select(self, history: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [row for row in history if self.match(Query.history_fields(row))]
+
+    @staticmethod
+    def fields(
+        ant_id: int,
+        name: str,
+        method: str,
+        triumph: int,
+        hits: int,
+        title: str,
+        message: str,
+    ) -> Fields:
+        return {
+            "id": ant_id,
+            "name": name.lower(),
+            "method": method.lower(),
+            "score": triumph - hits,
+            "triumph": triumph,
+            "hits": hits,
+            "text": f"{title}\n{message}".lower(),
+        }
+
+    @staticmethod
+    def history_fields(row: dict[str, Any]) -> Fields:
+        from .ants import Ant
+
+        # The same text the feed showed for it
+        ant = Ant()
+        ant.name = row["name"]
+        ant.status = row["status"]
+        ant.method = row["method"]
+        ant.triumph = row["triumph"]
+        ant.hits = row["hits"]
+        title, message = ant.get_text()
+
+        return Query.fields(
+            row["ant"], ant.name, ant.method, ant.triumph, ant.hits, title, message
+        )
+
+    @staticmethod
+    def make_term(token: str) -> Term:
+        negate = token[0] in "-!" and len(token) > 1
+
+        if negate:
+            token = token[1:]
+
+        if (len(token) > 2) and token.startswith("/") and token.endswith("/"):
+            try:
+                regex = re.compile(token[1:-1], re.IGNORECASE | re.MULTILINE)
+            except re.error:
+                pass
+            else:
+                return Term(token, lambda f: bool(regex.search(f["text"])), negate)
+
+        token = token.lower()
+        match = Query.field.match(token)
+
+        if match:
+            name, op, value = match.groups()
+            value = value.replace('"', "")
+            func = Query.operators[op]
+            key = f"{name}{op}{value}"
+
+            if name in Query.numbers:
+                try:
+                    number = int(value)
+                except ValueError:
+                    pass
+                else:
+                    return Term(key, lambda f: func(f[name], number), negate)
+            elif (name in Query.strings) and (op == ":"):
+                if name == "method":
+                    return Term(key, lambda f: f[name] == value, negate)
+
+                return Term(key, lambda f: value in f[name], negate)
+
+        # Anything else is some text to look for
+        text = token.replace('"', "")
+        return Term(token, lambda f: text in f["text"], negate, text)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import math
+import heapq
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ants import Ant
+
+
+Key = tuple[float, int, int, int]
+
+
+class Ranking:
+    # Ants in a binary heap from best to worst, by weighted score, then
+    # score, then the oldest one first, with the position of each ant kept
+    # so it can be moved or taken out in log time
+
+    def __init__(self) -> None:
+        self.keys: list[Key] = []
+        self.ants: dict[int, tuple[Key, Ant]] = {}
+        self.slots: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def key(ant: Ant) -> Key:
+        score = ant.get_score()
+        log_factor = 1 + math.log(ant.triumph + 1)
+        weighted_score = score * log_factor
+        return (-weighted_score, -score, ant.created, ant.id)
+
+    def build(self, ants: list[Ant]) -> None:
+        self.ants = {ant.id: (Ranking.key(ant), ant) for ant in ants}
+        self.keys = [key for key, _ in self.ants.values()]
+        heapq.heapify(self.keys)
+        self.slots = {key[3]: i for i, key in enumerate(self.keys)}
+
+    def clear(self) -> None:
+        self.keys = []
+        self.ants = {}
+        self.slots = {}
+
+    def add(self, ant: Ant) -> None:
+        if ant.id in self.ants:
+            self.update(ant)
+            return
+
+        key = Ranking.key(ant)
+        self.ants[ant.id] = (key, ant)
+        self.keys.append(key)
+        self.slots[ant.id] = len(self.keys) - 1
+        self.sift_up(len(self.keys) - 1)
+
+    def remove(self, ant: Ant) -> None:
+        if not self.ants.pop(ant.id, None):
+            return
+
+        i = self.slots.pop(ant.id)
+        last = self.keys.pop()
+
+        if i == len(self.keys):
+            return
+
+        self.keys[i] = last
+        self.slots[last[3]] = i
+        self.move(i)
+
+    def update(self, ant: Ant) -> None:
+        key = Ranking.key(ant)
+        item = self.ants.get(ant.id)
+
+        if not item:
+            self.add(ant)
+            return
+
+        # Only the counters matter, most updates don't touch them
+        if item[0] == key:
+            return
+
+        self.ants[ant.id] = (key, ant)
+        i = self.slots[ant.id]
+        self.keys[i] = key
+        self.move(i)
+
+    def move(self, i: int) -> None:
+        if (i > 0) and (self.keys[i] < self.keys[(i - 1) // 2]):
+            self.sift_up(i)
+        else:
+            self.sift_down(i)
+
+    def sift_up(self, i: int) -> None:
+        keys = self.keys
+        key = keys[i]
+
+        while i > 0:
+            parent = (i - 1) // 2
+
+            if not key < keys[parent]:
+                break
+
+            keys[i] = keys[parent]
+            self.slots[keys[i][3]] = i
+            i = parent
+
+        keys[i] = key
+        self.slots[key[3]] = i
+
+    def sift_down(self, i: int) -> None:
+        keys = self.keys
+        size = len(keys)
+        key = keys[i]
+
+        while True:
+            child = 2 * i + 1
+
+            if child >= size:
+                break
+
+            if (child + 1 < size) and (keys[child + 1] < keys[child]):
+                child += 1
+
+            if not keys[child] < key:
+                break
+
+            keys[i] = keys[child]
+            self.slots[keys[i][3]] = i
+            i = child
+
+        keys[i] = key
+        self.slots[key[3]] = i
+
+    def top(self) -> Ant | None:
+        if not self.keys:
+            return None
+
+        return self.ants[self.keys[0][3]][1]
+
+    def top_k(self, k: int) -> list[Ant]:
+        # Walk the heap best first, only the children of what was taken
+        # can be next
+        keys = self.keys
+        found: list[Ant] = []
+        edge: list[tuple[Key, int]] = [(keys[0], 0)] if keys else []
+
+        while edge and (len(found) < k):
+            key, i = heapq.heappop(edge)
+            found.append(self.ants[key[3]][1])
+
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(keys):
+                    heapq.heappush(edge, (keys[child], child))
+
+        return found
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+
+
+class AgeSampler:
+    # Fenwick tree over the update times of the ants in each slot
+    # The age of a slot is now - updated, so the total age of any
+    # block of slots is size * now - sum(updated), which lets the tree
+    # find a weighted slot without knowing the time in advance
+
+    def __init__(self) -> None:
+        self.values: list[int] = []
+        self.tree: list[int] = [0]
+        self.sum = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def build(self, values: list[int]) -> None:
+        self.values = list(values)
+        self.tree = [0, *self.values]
+        self.sum = sum(self.values)
+        size = len(self.tree)
+
+        for i in range(1, size):
+            parent = i + (i & -i)
+
+            if parent < size:
+                self.tree[parent] += self.tree[i]
+
+    def prefix(self, count: int) -> int:
+        total = 0
+
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+
+        return total
+
+    def append(self, value: int) -> None:
+        self.values.append(value)
+        index = len(self.values)
+        low = index - (index & -index)
+        self.tree.append(value + self.prefix(index - 1) - self.prefix(low))
+        self.sum += value
+
+    def pop(self) -> None:
+        # The last node never feeds any of the others
+        self.sum -= self.values.pop()
+        self.tree.pop()
+
+    def set(self, index: int, value: int) -> None:
+        delta = value - self.values[index]
+
+        if not delta:
+            return
+
+        self.values[index] = value
+        self.sum += delta
+        index += 1
+        size = len(self.tree)
+
+        while index < size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def choose(self, now: int) -> int | None:
+        size = len(self.values)
+
+        if not size:
+            return None
+
+        total = size * now - self.sum
+
+        # If all ages are zero, use equal weights
+        if total <= 0:
+            return random.randrange(size)
+
+        target = random.randrange(total)
+        pos = 0
+        step = 1 << size.bit_length()
+
+        while step:
+            nxt = pos + step
+
+            if nxt <= size:
+                weight = step * now - self.tree[nxt]
+
+                if weight <= target:
+                    target -= weight
+                    pos = nxt
+
+            step >>= 1
+
+        # Only reachable with update times from the future
+        return min(pos, size - 1)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import ClassVar
+from collections.abc import Callable
+
+from .config import Config
+from .args import Args
+from .utils import Utils
+
+
+class Sentences:
+    generators: ClassVar[dict[int, Callable[[], str]]] = {
+        1: Utils.words_1,
+        2: Utils.words_2,
+        3: Utils.words_3,
+        4: Utils.words_4,
+    }
+
+    pools: ClassVar[dict[int, deque[str]]] = {}
+    condition: ClassVar[threading.Condition] = threading.Condition()
+    thread: ClassVar[threading.Thread | None] = None
+    size: int = 0
+    refill: int = 0
+    misses: int = 0
+
+    @staticmethod
+    def prepare() -> None:
+        Sentences.pools = {n: deque() for n in Sentences.generators}
+        Sentences.size = Args.sentence_pool or Config.sentence_pool
+        Sentences.refill = min(
+            Args.sentence_refill or Config.sentence_refill, Sentences.size
+        )
+        Sentences.thread = threading.Thread(target=Sentences.run, daemon=True)
+        Sentences.thread.start()
+
+    @staticmethod
+    def get(n: int) -> str:
+        pool = Sentences.pools.get(n)
+
+        if not pool:
+            # The worker didn't keep up, make one here
+            if Sentences.thread:
+                Sentences.misses += 1
+
+            return Sentences.generators[n]()
+
+        sentence = pool.popleft()
+
+        if len(pool) < Sentences.refill:
+            with Sentences.condition:
+                Sentences.condition.notify()
+
+        return sentence
+
+    @staticmethod
+    def needs_refill() -> bool:
+        return any(len(pool) < Sentences.refill for pool in Sentences.pools.values())
+
+    @staticmethod
+    def run() -> None:
+        while True:
+            with Sentences.condition:
+                while not Sentences.needs_refill():
+                    Sentences.condition.wait()
+
+            for n, pool in Sentences.pools.items():
+                generator = Sentences.generators[n]
+
+                while len(pool) < Sentences.size:
+                    pool.append(generator())
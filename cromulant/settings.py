@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from .args import Args
-from .window import Window
 from .storage import Storage
 
 
@@ -27,9 +26,6 @@ class Settings:
         else:
             Settings.speed = settings.get("speed", "normal")
 
-        speed = Settings.speed.capitalize()
-        Window.speed.setCurrentText(speed)
-
         Settings.score_enabled = settings.get("score_enabled", True)
         Settings.travel_enabled = settings.get("travel_enabled", True)
         Settings.think_enabled = settings.get("think_enabled", True)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+import sys
+import itertools
+import mmap
+import struct
+from typing import Any, Literal
+from pathlib import Path
+from collections.abc import Iterator
+
+
+class SnapshotError(Exception):
+    def __init__(self, path: Path) -> None:
+        self.message = f"Can't read ants snapshot: {path}"
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class ByteOrderError(Exception):
+    def __init__(self) -> None:
+        self.message = "Ants snapshots need a little endian system"
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class TooManyMethodsError(Exception):
+    def __init__(self, num: int) -> None:
+        self.message = f"Too many methods for an ants snapshot: {num}"
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class Snapshot:
+    # Magic, version, number of ants, number of strings
+    header = struct.Struct("<4sHxxII")
+    magic = b"CRMA"
+    version = 1
+
+    # Column name and type code, wide columns first to keep them aligned
+    columns: tuple[tuple[str, Literal["q", "I", "B"]], ...] = (
+        ("id", "q"),
+        ("created", "q"),
+        ("updated", "q"),
+        ("triumph", "q"),
+        ("hits", "q"),
+        ("name", "I"),
+        ("status", "I"),
+        ("method", "B"),
+    )
+
+    def __init__(self, path: Path) -> None:
+        # Columns are read in place with the native byte order
+        if sys.byteorder != "little":
+            raise ByteOrderError
+
+        with path.open("rb") as file:
+            # Empty files can't be mapped
+            if os.fstat(file.fileno()).st_size < Snapshot.header.size:
+                raise SnapshotError(path)
+
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self.data)
+        magic, version, count, num_strings = Snapshot.header.unpack_from(view)
+
+        if (magic != Snapshot.magic) or (version != Snapshot.version):
+            raise SnapshotError(path)
+
+        # A truncated file would only fail later while building the ants
+        columns = sum(struct.calcsize(code) for _, code in Snapshot.columns)
+        strings = Snapshot.header.size + columns * count
+        blob = strings + 4 * (num_strings + 1)
+
+        if len(view) < blob:
+            raise SnapshotError(path)
+
+        self.count: int = count
+        self.cols: dict[str, memoryview] = {}
+        offset = Snapshot.header.size
+
+        for name, code in Snapshot.columns:
+            size = struct.calcsize(code) * count
+            self.cols[name] = view[offset : offset + size].cast(code)
+            offset += size
+
+        self.offsets = view[strings:blob].cast("I")
+        self.blob = view[blob:]
+
+        if self.offsets[-1] != len(self.blob):
+            raise SnapshotError(path)
+
+        for name in ("name", "status", "method"):
+            if count and (max(self.cols[name]) >= num_strings):
+                raise SnapshotError(path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def strings(self) -> list[str]:
+        blob = bytes(self.blob)
+        offsets = self.offsets.tolist()
+        return [str(blob[a:b], "utf-8") for a, b in itertools.pairwise(offsets)]
+
+    def table(self) -> Iterator[tuple[Any, ...]]:
+        # Whole columns at a time, in the order Ant.from_row takes them
+        cols = {name: view.tolist() for name, view in self.cols.items()}
+        strings = self.strings()
+
+        return zip(
+            cols["id"],
+            cols["created"],
+            cols["updated"],
+            [strings[i] for i in cols["name"]],
+            [strings[i] for i in cols["status"]],
+            [strings[i] for i in cols["method"]],
+            cols["triumph"],
+            cols["hits"],
+            strict=True,
+        )
+
+    @staticmethod
+    def write(path: Path, objs: list[dict[str, Any]]) -> None:
+        strings: dict[str, int] = {}
+
+        def intern(text: str) -> int:
+            index = strings.get(text)
+
+            if index is None:
+                index = len(strings)
+                strings[text] = index
+
+            return index
+
+        # Methods go first so their codes fit in a byte
+        methods = [intern(obj["method"]) for obj in objs]
+
+        # Method codes are stored in a single byte
+        if len(strings) > 256:
+            raise TooManyMethodsError(len(strings))
+
+        values: dict[str, list[int]] = {
+            "id": [obj["id"] for obj in objs],
+            "created": [obj["created"] for obj in objs],
+            "updated": [obj["updated"] for obj in objs],
+            "triumph": [obj["triumph"] for obj in objs],
+            "hits": [obj["hits"] for obj in objs],
+            "name": [intern(obj["name"]) for obj in objs],
+            "status": [intern(obj["status"]) for obj in objs],
+            "method": methods,
+        }
+
+        encoded = [text.encode("utf-8") for text in strings]
+        offsets = [0]
+
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+
+        count = len(objs)
+        temp = path.with_name(f"{path.name}.tmp")
+
+        with temp.open("wb") as file:
+            file.write(
+                Snapshot.header.pack(
+                    Snapshot.magic, Snapshot.version, count, len(encoded)
+                )
+            )
+
+            for name, code in Snapshot.columns:
+                file.write(struct.pack(f"<{count}{code}", *values[name]))
+
+            file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            file.write(b"".join(encoded))
+
+        temp.replace(path)
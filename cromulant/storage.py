@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, ClassVar, Any
 from pathlib import Path
 
 from .config import Config
@@ -11,9 +11,14 @@ if TYPE_CHECKING:
 
 from .args import Args
 from .utils import Utils
+from .writer import Writer
+from .database import Database
+from .snapshot import Snapshot
 
 
 class Storage:
+    journal_queue: ClassVar[list[Any]] = []
+
     @staticmethod
     def get_names_path() -> Path:
         path = Config.names_json
@@ -29,16 +34,30 @@ class Storage:
         path = Config.ants_json
 
         if Args.ants:
-            if Args.ants.exists():
+            # Databases and snapshots get created if they don't exist yet
+            if Args.ants.exists() or (Args.ants.suffix in (".db", ".bin")):
                 path = Args.ants
 
         return path
 
+    @staticmethod
+    def use_db() -> bool:
+        return Storage.get_ants_path().suffix == ".db"
+
     @staticmethod
     def get_ants() -> Any:
         try:
             path = Storage.get_ants_path()
 
+            if Storage.use_db():
+                return Database.get_ants(path)
+
+            if path.suffix == ".bin":
+                if not path.exists():
+                    return []
+
+                return Snapshot(path)
+
             with path.open() as file:
                 return json.load(file)
         except Exception as e:
@@ -50,8 +69,97 @@ class Storage:
         objs = [ant.to_dict() for ant in ants]
         path = Storage.get_ants_path()
 
-        with path.open("w") as file:
-            json.dump(objs, file)
+        # Pending records are the history of a database, so the rewrite
+        # goes after them in the same queue
+        if Storage.use_db():
+            Storage.append_journal([["a", objs]])
+            return
+
+        # The snapshot makes any pending journal records redundant
+        with Writer.condition:
+            Storage.journal_queue = []
+
+        Writer.submit("ants", Storage.write_ants, path, objs, cancel="journal")
+
+    @staticmethod
+    def write_ants(path: Path, objs: list[dict[str, Any]]) -> None:
+        if path.suffix == ".bin":
+            Snapshot.write(path, objs)
+        else:
+            temp = path.with_name(f"{path.name}.tmp")
+
+            with temp.open("w") as file:
+                json.dump(objs, file)
+
+            temp.replace(path)
+
+        # The snapshot includes everything the journal had
+        path.with_name(f"{path.name}.journal").unlink(missing_ok=True)
+
+    @staticmethod
+    def get_journal_path() -> Path:
+        path = Storage.get_ants_path()
+        return path.with_name(f"{path.name}.journal")
+
+    @staticmethod
+    def get_journal() -> list[Any]:
+        path = Storage.get_journal_path()
+        records: list[Any] = []
+
+        # Databases apply the records right away
+        if Storage.use_db() or (not path.exists()):
+            return records
+
+        with path.open() as file:
+            for line in file:
+                if not line.strip():
+                    continue
+
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Probably an incomplete write, ignore the tail
+                    Utils.print(f"Bad journal record: {line.strip()}")
+                    break
+
+        return records
+
+    @staticmethod
+    def append_journal(records: list[Any]) -> None:
+        with Writer.condition:
+            Storage.journal_queue.extend(records)
+
+        if Storage.use_db():
+            path = Storage.get_ants_path()
+        else:
+            path = Storage.get_journal_path()
+
+        Writer.submit("journal", Storage.write_journal, path)
+
+    @staticmethod
+    def write_journal(path: Path) -> None:
+        with Writer.condition:
+            records = Storage.journal_queue
+            Storage.journal_queue = []
+
+        if not records:
+            return
+
+        if path.suffix == ".db":
+            Database.apply(path, records)
+            return
+
+        with path.open("a") as file:
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")))
+                file.write("\n")
+
+    @staticmethod
+    def get_history(ant_id: int | None = None) -> list[dict[str, Any]]:
+        if not Storage.use_db():
+            return []
+
+        return Database.get_history(Storage.get_ants_path(), ant_id)
 
     @staticmethod
     def get_names() -> Any:
@@ -71,9 +179,42 @@ class Storage:
 
     @staticmethod
     def save_settings(settings: dict[str, Any]) -> None:
+        Writer.submit("settings", Storage.write_settings, settings)
+
+    @staticmethod
+    def write_settings(settings: dict[str, Any]) -> None:
         with Config.settings_json.open("w") as file:
             json.dump(settings, file)
 
+    @staticmethod
+    def get_cached(path: Path, key: str, stamp: Any) -> Any:
+        try:
+            with path.open() as file:
+                cache = json.load(file)
+        except Exception:
+            return None
+
+        item = cache.get(key)
+
+        # The stamp tells if the source changed since it was cached
+        if (not item) or (item.get("stamp") != stamp):
+            return None
+
+        return item["value"]
+
+    @staticmethod
+    def save_cached(path: Path, key: str, stamp: Any, value: Any) -> None:
+        try:
+            with path.open() as file:
+                cache = json.load(file)
+        except Exception:
+            cache = {}
+
+        cache[key] = {"stamp": stamp, "value": value}
+
+        with path.open("w") as file:
+            json.dump(cache, file)
+
     @staticmethod
     def get_countries() -> Any:
         with Config.countries_json.open() as file:
@@ -3,18 +3,31 @@ from __future__ import annotations
 import random
 import colorsys
 import time
+from array import array
+from pathlib import Path
 from datetime import datetime
+from importlib.metadata import version
 from typing import ClassVar
+from collections.abc import Container
 
 from wonderwords import RandomWord, RandomSentence  # type: ignore
 from fontTools.ttLib import TTFont  # type: ignore
 
 from .config import Config
+from .namepool import NamePool
+from .namefile import NameFile
+from .namemodel import NameModel
 
 
 class Utils:
-    names: ClassVar[list[str]] = []
+    names: ClassVar[NamePool | NameFile] = NamePool()
     countries: ClassVar[list[str]] = []
+    glyphs: ClassVar[dict[str, array[int]]] = {}
+    word_index: ClassVar[dict[str, list[str]]] = {}
+    name_model: ClassVar[NameModel | None] = None
+
+    # Set while past ticks are replayed, to stamp them with their time
+    clock: ClassVar[int | None] = None
     rand_word: RandomWord
     rand_sentence: RandomSentence
     vowels = "aeiou"
@@ -24,13 +37,23 @@ class Utils:
     def prepare() -> None:
         from .storage import Storage
 
-        Utils.names = Storage.get_names()
+        path = Storage.get_names_path()
+
+        # Text files can be too big to load
+        if path.suffix == ".txt":
+            Utils.names = NameFile(path)
+        else:
+            Utils.names = NamePool(Storage.get_names())
+
         Utils.countries = Storage.get_countries()
         Utils.rand_word = RandomWord()
         Utils.rand_sentence = RandomSentence()
 
     @staticmethod
     def now() -> int:
+        if Utils.clock is not None:
+            return Utils.clock
+
         return int(time.time())
 
     @staticmethod
@@ -96,42 +119,62 @@ class Utils:
         return r, g, b
 
     @staticmethod
-    def random_name(ignore: list[str], include: list[str] | None = None) -> str:
-        names = Utils.names
-
-        if include:
-            for name in include:
-                if name not in names:
-                    names.append(name)
-
-        filtered = [name for name in Utils.names if name not in ignore]
+    def random_names(num: int, ignore: Container[str]) -> list[str]:
+        names = Utils.names.draw_many(num, ignore)
 
-        if not filtered:
-            return Utils.make_name(ignore)
+        if len(names) < num:
+            names.extend(Utils.make_names(num - len(names)))
 
-        return random.choice(filtered)
+        return names
 
     @staticmethod
     def get_rgb(color: tuple[int, int, int]) -> str:
         return f"rgb{color}"
 
     @staticmethod
-    def random_character(font_path: str, num: int) -> str:
+    def get_glyphs(font_path: str) -> array[int]:
+        from .storage import Storage
+
+        glyphs = Utils.glyphs.get(font_path)
+
+        if glyphs is not None:
+            return glyphs
+
+        # Parsing the font is slow so the result is cached on disk
+        mtime = Path(font_path).stat().st_mtime
+        codes = Storage.get_cached(Config.glyphs_json, font_path, mtime)
+
+        if codes is None:
+            codes = Utils.read_glyphs(font_path)
+            Storage.save_cached(Config.glyphs_json, font_path, mtime, codes)
+
+        glyphs = array("I", codes)
+        Utils.glyphs[font_path] = glyphs
+        return glyphs
+
+    @staticmethod
+    def read_glyphs(font_path: str) -> list[int]:
         font = TTFont(font_path)
         unicode_map = font.getBestCmap()
 
         if not unicode_map:
-            return ""
+            return []
 
-        characters = [chr(code_point) for code_point in unicode_map]
+        return [
+            code_point
+            for code_point in unicode_map
+            if chr(code_point).isprintable() and (not chr(code_point).isspace())
+        ]
 
-        for _ in range(10):  # Try up to 10 times
-            selected = random.sample(characters, num)
+    @staticmethod
+    def random_character(font_path: str, num: int) -> str:
+        glyphs = Utils.get_glyphs(font_path)
 
-            if all((char.isprintable() and not char.isspace()) for char in selected):
-                return " ".join(selected)
+        if len(glyphs) < num:
+            return ""
 
-        return ""
+        selected = random.sample(glyphs, num)
+        return " ".join(chr(code_point) for code_point in selected)
 
     @staticmethod
     def random_emoji(num: int) -> str:
@@ -165,7 +208,9 @@ class Utils:
         return random.choice(filtered)
 
     @staticmethod
-    def random_word(noun: bool = True, adj: bool = True) -> str:
+    def get_words(noun: bool = True, adj: bool = True) -> list[str]:
+        from .storage import Storage
+
         opts = []
 
         if noun:
@@ -175,14 +220,47 @@ class Utils:
             opts.append("adjective")
 
         if not len(opts):
+            return []
+
+        key = f"{'+'.join(opts)}:{Config.word_max_length}"
+        words = Utils.word_index.get(key)
+
+        if words is not None:
+            return words
+
+        # Filtering the word lists is slow so the result is cached on disk
+        wonderwords = version("wonderwords")
+        words = Storage.get_cached(Config.words_json, key, wonderwords)
+
+        if words is None:
+            words = sorted(
+                Utils.rand_word.filter(
+                    include_categories=opts, word_max_length=Config.word_max_length
+                )
+            )
+
+            Storage.save_cached(Config.words_json, key, wonderwords, words)
+
+        Utils.word_index[key] = words
+        return words
+
+    @staticmethod
+    def random_word(noun: bool = True, adj: bool = True) -> str:
+        words = Utils.get_words(noun=noun, adj=adj)
+
+        if not words:
             return ""
 
-        word = Utils.rand_word.word(include_parts_of_speech=opts, word_max_length=8)
-        return str(word)
+        return random.choice(words)
 
     @staticmethod
     def random_words(num: int = 1, noun: bool = True, adj: bool = True) -> list[str]:
-        return [Utils.random_word(noun=noun) for _ in range(num)]
+        words = Utils.get_words(noun=noun, adj=adj)
+
+        if not words:
+            return []
+
+        return random.choices(words, k=num)
 
     @staticmethod
     def capitalize(word: str) -> str:
@@ -218,13 +296,50 @@ class Utils:
         return [Utils.make_word() for _ in range(num)]
 
     @staticmethod
-    def make_name(ignore: list[str], num_words: int = 2) -> str:
+    def get_name_model() -> NameModel:
+        from .storage import Storage
+
+        if Utils.name_model is not None:
+            return Utils.name_model
+
+        # Training only happens when the names file changes
+        path = Storage.get_names_path()
+        stamp = [path.stat().st_mtime, NameModel.version]
+        table = Storage.get_cached(Config.name_model_json, str(path), stamp)
+
+        if table is None:
+            model = NameModel.train(Utils.names.sample(Config.name_model_sample))
+            Storage.save_cached(Config.name_model_json, str(path), stamp, model.table)
+        else:
+            model = NameModel(table)
+
+        Utils.name_model = model
+        return model
+
+    @staticmethod
+    def make_name(ignore: Container[str], num_words: int = 2) -> str:
+        model = Utils.get_name_model()
+
         for _ in range(100):
-            words = Utils.make_words(num_words)
-            words = [word.capitalize() for word in words]
-            name = " ".join(words)
+            name = model.name(num_words)
+
+            if not name:
+                words = Utils.make_words(num_words)
+                name = " ".join(word.capitalize() for word in words)
 
             if name not in ignore:
                 return name
 
         return Utils.make_name(ignore, num_words + 1)
+
+    @staticmethod
+    def make_names(num: int) -> list[str]:
+        names = []
+
+        # Taken right away so the next ones don't repeat them
+        for _ in range(num):
+            name = Utils.make_name(Utils.names)
+            Utils.names.take(name)
+            names.append(name)
+
+        return names
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+from .config import Config
+from .utils import Utils
+from .ants import Ant
+from .ants import Ants
+from .settings import Settings
+from .alias import AliasTable
+from .engine import Engine
+from .engine import Opts
+
+
+class VectorError(Exception):
+    def __init__(self) -> None:
+        self.message = "The vector engine needs numpy"
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class VectorColony:
+    # The colony as numpy columns, to run many ticks in one call
+    # Each ant is picked with the same odds as Ants.get_next and the
+    # events are drawn from the same tables as Engine.tick, but the
+    # status text is only made once for each ant, when applying
+
+    chunk = 4096
+
+    def __init__(self) -> None:
+        if np is None:
+            raise VectorError
+
+        self.rng = np.random.default_rng()
+        self.ticks = 0
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.origin)
+
+    def load(self) -> None:
+        ants = Ants.ants
+        self.ids = np.array([ant.id for ant in ants], dtype=np.int64)
+        self.created = np.array([ant.created for ant in ants], dtype=np.int64)
+        self.updated = np.array([ant.updated for ant in ants], dtype=np.int64)
+        self.triumph = np.array([ant.triumph for ant in ants], dtype=np.int64)
+        self.hits = np.array([ant.hits for ant in ants], dtype=np.int64)
+
+        # The last event of each row, -1 if nothing happened to it
+        self.events = np.full(len(ants), -1, dtype=np.int16)
+
+        # The ant behind each row, None for the ones born here
+        self.origin: list[Ant | None] = list(ants)
+        self.names = [ant.name for ant in ants]
+        self.terminated: list[Ant] = []
+        self.next_id = Ants.next_id
+        self.charge = Engine.merge_charge
+
+    def draw(self, table: AliasTable | None, num: int) -> list[int] | None:
+        if not table:
+            return None
+
+        prob = np.array(table.prob)
+        alias = np.array(table.alias)
+        values = np.array(table.values)
+        cols = self.rng.integers(0, len(table), num)
+        coins = self.rng.random(num)
+        picked = np.where(coins < prob[cols], cols, alias[cols])
+        result: list[int] = values[picked].tolist()
+        return result
+
+    def propose(self, cum: Any, num: int) -> tuple[list[int], list[float]]:
+        targets = self.rng.random(num) * cum[-1]
+        picks: list[int] = np.searchsorted(cum, targets, side="right").tolist()
+        coins: list[float] = self.rng.random(num).tolist()
+        size = len(cum) - 1
+        return [min(pick, size) for pick in picks], coins
+
+    def run(self, ticks: int, start: int | None = None, interval: int = 0) -> None:
+        # Tick number n happens at start + n * interval
+        if start is None:
+            start = Utils.now()
+
+        done = 0
+
+        while done < ticks:
+            num = min(VectorColony.chunk, ticks - done)
+            self.run_chunk(num, start + done * interval, interval)
+            done += num
+
+        self.ticks += ticks
+
+    def run_chunk(self, num: int, start: int, interval: int) -> None:
+        size = len(self.origin)
+
+        if not size:
+            return
+
+        end = start + (num - 1) * interval
+        first = self.updated.tolist()
+        updated = list(first)
+        triumph = self.triumph.tolist()
+        hits = self.hits.tolist()
+        created = self.created.tolist()
+        ids = self.ids.tolist()
+        events = self.events.tolist()
+        total = sum(updated)
+
+        # Ages only shrink during the chunk, so rows proposed with their
+        # age at the end and accepted with their current one over that
+        # come out with the same odds as the sampler
+        ages = np.maximum(end - self.updated, 0).astype(np.float64)
+        cum = np.cumsum(ages)
+        props: list[int] = []
+        coins: list[float] = []
+        pos = 0
+
+        merge = Settings.merge
+        goal = Config.merge_goal
+        plain = self.draw(Opts.get_table(False), num)
+        charged = self.draw(Opts.get_table(True), num) if merge else plain
+        fallback = self.draw(Opts.get_table(False), num)
+        merge_value = Opts.merge.value
+        triumph_value = Opts.triumph.value
+        hit_value = Opts.hit.value
+
+        for tick in range(num):
+            now = start + tick * interval
+
+            # Same as the sampler when every age is zero
+            if (size * now - total <= 0) or (cum[-1] <= 0):
+                row = random.randrange(size)
+            else:
+                while True:
+                    if pos >= len(props):
+                        props, coins = self.propose(cum, num)
+                        pos = 0
+
+                    row = props[pos]
+                    coin = coins[pos]
+                    pos += 1
+
+                    if coin * (end - first[row]) < now - updated[row]:
+                        break
+
+            if self.charge < goal:
+                self.charge += 1
+
+            values = charged if (merge and self.charge >= goal) else plain
+
+            if values is None:
+                continue
+
+            value = values[tick]
+
+            if value == merge_value:
+                delta = self.merge(now, updated, triumph, hits, created, ids, events)
+
+                if delta is not None:
+                    total += delta
+                    self.charge = 0
+                    continue
+
+                if fallback is None:
+                    continue
+
+                value = fallback[tick]
+
+            total += now - updated[row]
+            updated[row] = now
+            events[row] = value
+
+            if value == triumph_value:
+                triumph[row] += 1
+            elif value == hit_value:
+                hits[row] += 1
+
+        self.updated = np.array(updated, dtype=np.int64)
+        self.triumph = np.array(triumph, dtype=np.int64)
+        self.hits = np.array(hits, dtype=np.int64)
+        self.created = np.array(created, dtype=np.int64)
+        self.ids = np.array(ids, dtype=np.int64)
+        self.events = np.array(events, dtype=np.int16)
+
+    def merge(
+        self,
+        now: int,
+        updated: list[int],
+        triumph: list[int],
+        hits: list[int],
+        created: list[int],
+        ids: list[int],
+        events: list[int],
+    ) -> int | None:
+        # Returns how much the sum of the update times changed
+        size = len(self.origin)
+
+        if size < 2:
+            return None
+
+        row_1 = random.randrange(size)
+        row_2 = random.randrange(size - 1)
+
+        if row_2 >= row_1:
+            row_2 += 1
+
+        name_1 = self.names[row_1]
+        name_2 = self.names[row_2]
+        name = Ants.merge_name(name_1, name_2)
+
+        if not name:
+            return None
+
+        # The merged ant takes the first row and a new one the second
+        for row in (row_1, row_2):
+            ant = self.origin[row]
+
+            if ant:
+                self.terminated.append(ant)
+            else:
+                Utils.names.release(self.names[row])
+
+        Utils.names.take(name)
+        hatched = Ants.random_names(1, [name_1, name_2])[0]
+        delta = 2 * now - updated[row_1] - updated[row_2]
+
+        for row, new_name, wins, losses in (
+            (row_1, name, triumph[row_1] + triumph[row_2], hits[row_1] + hits[row_2]),
+            (row_2, hatched, 0, 0),
+        ):
+            self.origin[row] = None
+            self.names[row] = new_name
+            ids[row] = self.next_id
+            created[row] = now
+            updated[row] = now
+            triumph[row] = wins
+            hits[row] = losses
+            events[row] = -1
+            self.next_id += 1
+
+        return delta
+
+    def top(self) -> int | None:
+        # The row of the best ant, with the same order as Ranking
+        if not len(self.origin):
+            return None
+
+        score = self.triumph - self.hits
+        weighted = score * (1 + np.log(self.triumph + 1))
+        order = np.lexsort((self.ids, self.created, -score, -weighted))
+        return int(order[0])
+
+    def apply(self) -> None:
+        # Put the results back in the colony and save once
+        born: list[Ant] = []
+        ids = self.ids.tolist()
+        created = self.created.tolist()
+        updated = self.updated.tolist()
+        triumph = self.triumph.tolist()
+        hits = self.hits.tolist()
+        events = self.events.tolist()
+
+        with Ants.batch():
+            for ant in self.terminated:
+                ant.method = "terminated"
+                Ants.drop(ant)
+                Ants.record("t", ant.id, ant.to_dict())
+
+            for row, origin in enumerate(self.origin):
+                event = events[row]
+
+                if origin:
+                    if event < 0:
+                        continue
+
+                    ant = origin
+                else:
+                    ant = Ant()
+                    ant.id = ids[row]
+                    ant.name = self.names[row]
+                    ant.created = created[row]
+
+                ant.updated = updated[row]
+                ant.triumph = triumph[row]
+                ant.hits = hits[row]
+
+                if event >= 0:
+                    status, method = Engine.describe(event)
+                    ant.status = status.strip()
+                    ant.method = method
+
+                if not origin:
+                    born.append(ant)
+                    continue
+
+                Ants.sampler.set(ant.slot, ant.updated)
+                Ants.ranking.update(ant)
+                Ants.touch(ant)
+
+                Ants.record(
+                    "s",
+                    ant.id,
+                    ant.status,
+                    ant.method,
+                    ant.updated,
+                    ant.triumph,
+                    ant.hits,
+                )
+
+            Ants.add_many(born)
+
+            for ant in born:
+                Ants.touch(ant)
+                Ants.record("h", ant.to_dict())
+
+            Engine.merge_charge = self.charge
+            Ants.on_change()
+
+        # Removing ants moves the others around
+        self.load()
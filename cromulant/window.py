@@ -13,10 +13,7 @@ from PySide6.QtWidgets import QVBoxLayout
 from PySide6.QtWidgets import QLabel
 from PySide6.QtWidgets import QPushButton
 from PySide6.QtWidgets import QHBoxLayout
-from PySide6.QtWidgets import QScrollArea
 from PySide6.QtWidgets import QComboBox
-from PySide6.QtWidgets import QLayout
-from PySide6.QtWidgets import QSizePolicy
 from PySide6.QtWidgets import QMessageBox
 from PySide6.QtWidgets import QLineEdit
 from PySide6.QtGui import QShortcut  # type: ignore
@@ -28,12 +25,16 @@ from PySide6.QtGui import QMouseEvent
 from PySide6.QtCore import Qt  # type: ignore
 from PySide6.QtCore import QUrl
 from PySide6.QtCore import Signal
+from PySide6.QtCore import QTimer
 from PySide6.QtMultimedia import QMediaPlayer  # type: ignore
 from PySide6.QtMultimedia import QAudioOutput
 
 from .config import Config
 from .args import Args
 from .utils import Utils
+from .writer import Writer
+from .database import Database
+from .feed import FeedView
 
 
 class SpecialButton(QPushButton):  # type: ignore
@@ -111,10 +112,9 @@ class Window:
     app: QApplication
     window: QMainWindow
     root: QVBoxLayout
-    view: QVBoxLayout
+    view: FeedView
     view_scene: QGraphicsScene
     speed: QComboBox
-    scroll_area: QScrollArea
     top: QPushButton
     info: QPushButton
     font: str
@@ -123,6 +123,7 @@ class Window:
     player: QMediaPlayer
     audio: QAudioOutput
     filter: QLineEdit
+    signal_timer: QTimer
 
     @staticmethod
     def prepare() -> None:
@@ -252,11 +253,6 @@ class Window:
             border: 1px solid {Config.input_border_color};
         }}
 
-        QFrame#horizontal_line {{
-            background-color: white;
-            color: white;
-        }}
-
         QLabel#menu_label:hover {{
             background-color: {Config.alt_hover_background_color};
         }}
@@ -308,6 +304,14 @@ class Window:
         Window.top.clicked.connect(Window.to_top)
         Window.filter = FilterLineEdit()
         Window.filter.setPlaceholderText("Filter")
+
+        Window.filter.setToolTip(
+            "Words must all match, quotes keep them together\n"
+            'name:"Some Name" method:triumph id:12\n'
+            "score>10 triumph>=5 hits<3\n"
+            "/regex/ to match the text\n"
+            "-word to leave out, or to match either side"
+        )
         Window.filter.keyReleaseEvent = lambda e: Filter.filter(e)
 
         container.addWidget(btn_menu, 1)
@@ -324,77 +328,49 @@ class Window:
 
     @staticmethod
     def add_view() -> None:
-        Window.scroll_area = QScrollArea()
-        Window.scroll_area.setWidgetResizable(True)
-
-        container = QWidget()
-        container.setStyleSheet(f"font-size: {Args.font_size}px;")
-
-        parent = QVBoxLayout(container)
-        Window.view = QVBoxLayout()
-        parent.addLayout(Window.view)
-
-        Window.view.setAlignment(Qt.AlignmentFlag.AlignTop)
-        Window.scroll_area.setWidget(container)
-        Window.root.addWidget(Window.scroll_area)
+        Window.view = FeedView()
+        Window.view.setStyleSheet(f"font-size: {Args.font_size}px;")
+        Window.root.addWidget(Window.view)
 
     @staticmethod
     def start() -> None:
-        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, lambda *args: Window.close())
+
+        # Give the interpreter a chance to handle signals
+        Window.signal_timer = QTimer()
+        Window.signal_timer.timeout.connect(lambda: None)
+        Window.signal_timer.start(500)
+
         Window.window.show()
         Window.app.exec()
 
+        # Make sure the latest state is on disk
+        Writer.stop()
+        Database.close()
+
     @staticmethod
     def close() -> None:
         Window.app.quit()
 
-    @staticmethod
-    def delete_layout(layout: QLayout) -> None:
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-
-            if widget:
-                widget.deleteLater()
-            elif item.layout():
-                Window.delete_layout(item.layout())
-
-        layout.deleteLater()
-
-    @staticmethod
-    def expand(widget: QWidget) -> None:
-        widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-
-    @staticmethod
-    def expand_2(widget: QWidget) -> None:
-        widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-
     @staticmethod
     def clear_view() -> None:
-        while Window.view.count():
-            item = Window.view.takeAt(0)
-            widget = item.widget()
-
-            if widget:
-                widget.deleteLater()
-            elif item.layout():
-                Window.delete_layout(item.layout())
+        Window.view.clear()
 
     @staticmethod
     def to_top() -> None:
-        Window.scroll_area.verticalScrollBar().setValue(0)
+        Window.view.verticalScrollBar().setValue(0)
 
     @staticmethod
     def to_bottom() -> None:
-        Window.scroll_area.verticalScrollBar().setValue(
-            Window.scroll_area.verticalScrollBar().maximum()
+        Window.view.verticalScrollBar().setValue(
+            Window.view.verticalScrollBar().maximum()
         )
 
     @staticmethod
     def toggle_scroll() -> None:
-        maxim = Window.scroll_area.verticalScrollBar().maximum()
+        maxim = Window.view.verticalScrollBar().maximum()
 
-        if Window.scroll_area.verticalScrollBar().value() == maxim:
+        if Window.view.verticalScrollBar().value() == maxim:
             Window.to_top()
         else:
             Window.to_bottom()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import time
+import threading
+from typing import ClassVar, Any
+from collections.abc import Callable
+
+from .config import Config
+from .args import Args
+from .utils import Utils
+
+
+class Writer:
+    thread: ClassVar[threading.Thread | None] = None
+    condition: ClassVar[threading.Condition] = threading.Condition()
+    jobs: ClassVar[dict[str, tuple[Callable[..., None], tuple[Any, ...]]]] = {}
+    delay: float = 0
+    stopping: bool = False
+
+    @staticmethod
+    def prepare() -> None:
+        Writer.delay = (Args.write_delay or Config.write_delay) / 1000
+        Writer.stopping = False
+        Writer.thread = threading.Thread(target=Writer.run, daemon=True)
+        Writer.thread.start()
+
+    @staticmethod
+    def submit(
+        key: str, func: Callable[..., None], *args: Any, cancel: str = ""
+    ) -> None:
+        # Without a thread just write right away
+        if not Writer.thread:
+            func(*args)
+            return
+
+        with Writer.condition:
+            if cancel:
+                Writer.jobs.pop(cancel, None)
+
+            # A newer job with the same key replaces the pending one
+            Writer.jobs.pop(key, None)
+            Writer.jobs[key] = (func, args)
+            Writer.condition.notify()
+
+    @staticmethod
+    def run() -> None:
+        while True:
+            with Writer.condition:
+                while (not Writer.jobs) and (not Writer.stopping):
+                    Writer.condition.wait()
+
+                if Writer.stopping and (not Writer.jobs):
+                    return
+
+                # Give the burst some time to settle
+                deadline = time.monotonic() + Writer.delay
+
+                while not Writer.stopping:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        break
+
+                    Writer.condition.wait(remaining)
+
+                jobs = list(Writer.jobs.values())
+                Writer.jobs.clear()
+
+            for func, args in jobs:
+                try:
+                    func(*args)
+                except Exception as e:
+                    Utils.print(f"Write failed: {e}")
+
+    @staticmethod
+    def stop() -> None:
+        thread = Writer.thread
+
+        if not thread:
+            return
+
+        with Writer.condition:
+            Writer.stopping = True
+            Writer.condition.notify()
+
+        thread.join()
+        Writer.thread = None
@@ -55,7 +55,12 @@ setup(
     packages=find_packages(where="."),
     package_dir={"": "."},
     package_data=package_data,
-    entry_points={"console_scripts": [f"{program}={program}.main:main"]},
+    entry_points={
+        "console_scripts": [
+            f"{program}={program}.main:main",
+            f"{program}-bench={program}.bench:main",
+        ]
+    },
 )
 
 _post_install()